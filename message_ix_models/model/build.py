@@ -1,5 +1,7 @@
 import logging
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional, Union
 
 import ixmp
@@ -13,22 +15,135 @@ from message_ix_models.util.scenarioinfo import ScenarioInfo, Spec
 
 log = logging.getLogger(__name__)
 
+#: Minimum level of log records from this module; see :func:`_log_level`.
+_LEVEL: ContextVar[int] = ContextVar(f"{__name__}.level", default=logging.NOTSET)
+
+
+def _level_filter(record: logging.LogRecord) -> bool:
+    return record.levelno >= _LEVEL.get()
+
+
+log.addFilter(_level_filter)
+
+
+@contextmanager
+def _log_level(level: int):
+    """Context manager to drop log records below `level` from this module.
+
+    Unlike :meth:`logging.Logger.setLevel`, this does not change the logger for other
+    callers or threads, and the previous state is restored on exit.
+    """
+    token = _LEVEL.set(level)
+    try:
+        yield
+    finally:
+        _LEVEL.reset(token)
+
 
 def _add_unit(mp: ixmp.Platform, unit: str, comment: str) -> None:
     """Handle exceptions in :meth:`.Platform.add_unit`."""
     # TODO move upstream to ixmp.JDBCBackend
-    log.info(f"Add unit {repr(unit)}")
+    log.info("Add unit %r", unit)
     try:
         mp.add_unit(unit, comment)
     except Exception as e:  # pragma: no cover
         if "Error assigning an unit-key-id mapping" in str(e) and "" == str(unit):
-            log.warning(f"…skip {repr(unit)} (ixmp.JDBCBackend with Oracle database)")
+            log.warning("…skip %r (ixmp.JDBCBackend with Oracle database)", unit)
         else:
             raise
 
 
-# FIXME Reduce complexity from 14 to ≤13
-def apply_spec(  # noqa: C901
+def _ids(items: Iterable) -> list:
+    """Return the IDs of `items`, which may be :class:`.Code` or other objects."""
+    return [i.id if isinstance(i, Code) else i for i in items]
+
+
+def _new_elements(
+    base_set: Union[pd.Series, pd.DataFrame, None], names: list, removed: list
+) -> list:
+    """Return elements of `names` that are not in `base_set`, or are in `removed`.
+
+    If `base_set` is :obj:`None` (not retrieved), all of `names` are returned.
+    """
+    if base_set is None:
+        return names
+
+    if isinstance(base_set, pd.DataFrame):
+        # Compare tuples of str, one per row of an indexed set
+        def key(e):
+            return tuple(map(str, e)) if isinstance(e, (list, tuple)) else (str(e),)
+
+        existing = set(base_set.astype(str).itertuples(index=False, name=None))
+    else:
+        key = str
+        existing = set(map(str, base_set))
+
+    existing -= set(map(key, removed))
+    return [e for e in names if key(e) not in existing]
+
+
+def _add_set_key(
+    scenario: Scenario, set_name: str, names: list
+) -> Union[list, pd.DataFrame]:
+    """Prepare `names` for a single call to :meth:`.Scenario.add_set`.
+
+    Elements of a basic set are returned as a list. Elements of an indexed set (usually
+    tuples) are assembled into a :class:`pandas.DataFrame` with the index names of
+    `set_name` as columns.
+    """
+    idx_names = scenario.idx_names(set_name)
+    if not len(idx_names):
+        return names
+    return pd.DataFrame(
+        [e if isinstance(e, (list, tuple)) else (e,) for e in names],
+        columns=idx_names,
+    )
+
+
+def _missing(base_set: Union[pd.Series, pd.DataFrame], require) -> list:
+    """Return elements of `require` that are not in `base_set`.
+
+    For a multi-dimensional/indexed set, `base_set` is a :class:`pandas.DataFrame`; the
+    required elements (usually tuples) are compared against it in a single merge.
+    """
+    if not len(require):
+        return []
+    elif not isinstance(base_set, pd.DataFrame):
+        base = frozenset(base_set)
+        return [e for e in require if e not in base]
+
+    req_df = (
+        require
+        if isinstance(require, pd.DataFrame)
+        else pd.DataFrame(list(require), columns=base_set.columns)
+    ).astype(str)
+    merged = req_df.merge(
+        base_set.astype(str).drop_duplicates(), how="left", indicator=True
+    )
+    return list(
+        merged.query("_merge == 'left_only'")
+        .drop("_merge", axis=1)
+        .itertuples(index=False, name=None)
+    )
+
+
+def _base_set(
+    scenario: Scenario,
+    spec: Union[Spec, Mapping[str, ScenarioInfo]],
+    set_name: str,
+    fast: bool = False,
+) -> Union[pd.Series, pd.DataFrame, None]:
+    """Retrieve the base contents of `set_name` in `scenario`.
+
+    If `fast` is :obj:`True` and there are no required elements for `set_name`, the
+    base contents are not retrieved and :obj:`None` is returned.
+    """
+    if fast and not len(spec["require"].set.get(set_name, [])):
+        return None
+    return scenario.set(set_name)
+
+
+def apply_spec(
     scenario: Scenario,
     spec: Union[Spec, Mapping[str, ScenarioInfo]],
     data: Optional[Callable] = None,
@@ -52,12 +167,24 @@ def apply_spec(  # noqa: C901
         missing; this serves as a check that the scenario has the required features for
         applying the spec.
     fast : bool
-        Do not remove existing parameter data; increases speed on large scenarios.
+        Do not remove existing parameter data, and do not retrieve the existing
+        contents of sets unless needed to check required elements; increases speed on
+        large scenarios.
+    has_solution : bool, optional
+        Whether `scenario` has a solution. If :obj:`False`, do not attempt to remove the
+        solution; callers that apply several specs in sequence can use this to skip a
+        query to the backend. If :obj:`None` (default), remove any solution.
     quiet : bool
         Only show log messages at level ``ERROR`` and higher. If :obj:`False` (default),
-        show log messages at level ``DEBUG`` and higher.
+        defer to the configured level of the logger. This applies only for the duration
+        of the call, and only in the current thread/context.
     message : str
         Commit message.
+    batch_commit_size : int, optional
+        If given, commit `scenario` (and check it out again) each time at least this
+        many rows of parameter data have been removed. This bounds the size of the
+        transaction for very large removals, at the cost of intermediate commits. By
+        default, all changes are committed once, at the end.
 
     See also
     --------
@@ -66,90 +193,155 @@ def apply_spec(  # noqa: C901
     .Code
     .ScenarioInfo
     """
+    with _log_level(logging.ERROR if options.get("quiet", False) else logging.NOTSET):
+        _apply_spec(scenario, spec, data, **options)
+
+
+# FIXME Reduce complexity from 14 to ≤13
+def _apply_spec(  # noqa: C901
+    scenario: Scenario,
+    spec: Union[Spec, Mapping[str, ScenarioInfo]],
+    data: Optional[Callable] = None,
+    **options,
+) -> None:
+    """Implementation of :func:`.apply_spec`."""
     dry_run = options.get("dry_run", False)
     fast = options.get("fast", False)
 
-    log.setLevel(logging.ERROR if options.get("quiet", False) else logging.DEBUG)
-
     if not dry_run:
-        try:
+        has_solution = options.get("has_solution", None)
+        if has_solution is None:
+            try:
+                scenario.remove_solution()
+            except ValueError:
+                pass
+        elif has_solution:
             scenario.remove_solution()
-        except ValueError:
-            pass
         maybe_check_out(scenario)
 
-    dump: dict[str, pd.DataFrame] = {}  # Removed data
+    # Total number of rows removed, and number removed since the last commit
+    N_removed = pending = 0
+    batch_size = options.get("batch_commit_size", None)
+
+    # Names of items and their indices, retrieved once and reused for every set
+    set_list = set(scenario.set_list())
+    par_list = scenario.par_list()
+    par_index: dict[str, list[tuple[str, str]]] = {}
+
+    # Names of sets that are mentioned at all in the spec, i.e. with ≥1 element in any
+    # of add/remove/require. Other sets are not touched.
+    touched = {
+        name
+        for info in spec.values()
+        for name, elements in info.set.items()
+        if len(elements)
+    } & set_list
 
     # Sort the list of sets by the number of dimensions; this places basic (non-indexed)
     # sets first. Elements for these sets must be added before elements for indexed
     # sets that may reference them.
-    sets = sorted((len(scenario.idx_sets(s)), s) for s in scenario.set_list())
+    sets = sorted((len(scenario.idx_sets(s)), s) for s in touched)
 
     # Existing 'region' codes stored on the Platform associated with `scenario`
     platform_regions = set(scenario.platform.regions()["region"])
 
-    for _, set_name in sets:
-        # Check whether this set is mentioned at all in the spec
-        if 0 == sum(map(lambda info: len(info.set[set_name]), spec.values())):
-            # Not mentioned; don't do anything
-            continue
+    # If the spec only adds elements—common when building a model—there is nothing to
+    # check or remove, and the base contents of sets are not needed
+    add_only = not any(
+        len(spec[k].set.get(name, []))
+        for k in ("remove", "require")
+        for name in touched
+    )
+
+    # Retrieve the base contents of each set
+    names = [s for _, s in sets]
+    if add_only:
+        base_sets: list = [None] * len(names)
+    else:
+        base_sets = [_base_set(scenario, spec, s, fast=fast) for s in names]
 
-        log.info(f"Set {repr(set_name)}")
+    # Check for required elements
+    required = [spec["require"].set.get(s, []) for s in names]
+    missing_all = list(map(_missing, base_sets, required))
 
-        # Base contents of the set
-        base_set = scenario.set(set_name)
-        # Unpack a multi-dimensional/indexed set to a list of tuples
-        base = (
-            list(base_set.itertuples(index=False))
-            if isinstance(base_set, pd.DataFrame)
-            else base_set.tolist()
-        )
+    # Raise an exception about the missing elements, before any set is changed or
+    # `scenario` is committed
+    if any(missing_all):
+        for set_name, missing in filter(lambda x: x[1], zip(names, missing_all)):
+            log.info("Set %r", set_name)
+            log.error("  %d elements not found: %r", len(missing), missing)
+        raise ValueError
 
-        log.info(f"  {len(base)} elements")
-        # log.debug(', '.join(map(repr, base)))  # All elements; verbose
+    # Apply changes to each set in order
+    for set_name, base_set in zip(names, base_sets):
+        log.info("Set %r", set_name)
 
-        # Check for required elements
-        require = spec["require"].set[set_name]
-        log.info(f"  Check {len(require)} required elements")
+        if base_set is not None:
+            log.info("  %d elements", len(base_set))
+            # log.debug(', '.join(map(repr, base_set)))  # All elements; verbose
 
-        # Raise an exception about the first missing element
-        missing = list(filter(lambda e: e not in base, require))
-        if missing:
-            log.error(f"  {len(missing)} elements not found: {missing!r}")
-            raise ValueError
+        require = spec["require"].set.get(set_name, [])
+        log.info("  Check %d required elements", len(require))
 
         # Remove elements and associated parameter values
-        for element in spec["remove"].set[set_name]:
-            strip_par_data(
+        remove = list(spec["remove"].set.get(set_name, []))
+        if len(remove):
+            # Removed data are only counted, not retained
+            N = strip_par_data(
                 scenario,
                 set_name,
-                element,
+                remove,
                 dry_run=dry_run,
-                dump=None if fast else dump,
+                dump=None if fast else {},
+                par_list=par_list,
+                index=par_index,
             )
+            N_removed += N
+            pending += N
 
-        # Add elements
-        add = [] if dry_run else spec["add"].set[set_name]
-        for element in add:
-            name = element.id if isinstance(element, Code) else element
-            scenario.add_set(set_name, name)
-            if set_name == "node" and name not in platform_regions:
-                scenario.platform.add_region(name, "region")
+        if batch_size and pending >= batch_size and not dry_run:
+            log.info("  Commit after removing %d rows", pending)
+            scenario.commit(f"{__name__}.apply_spec() (partial)")
+            scenario.check_out()
+            pending = 0
 
+        # Add elements
+        add = [] if dry_run else spec["add"].set.get(set_name, [])
         if len(add):
-            log.info(f"  Add {len(add)} element(s)")
-            log.debug("  " + ellipsize(add))
+            add_ids = _ids(add)
+            # Omit elements already present in the base set and not removed above
+            to_add = _new_elements(base_set, add_ids, _ids(remove))
+            if len(to_add) < len(add_ids):
+                log.debug("  Skip %d existing element(s)", len(add_ids) - len(to_add))
+            if to_add:
+                # Add all elements with a single call
+                scenario.add_set(set_name, _add_set_key(scenario, set_name, to_add))
+
+            if set_name == "node":
+                for name in filter(lambda n: n not in platform_regions, add_ids):
+                    scenario.platform.add_region(name, "region")
+
+            log.info("  Add %d element(s)", len(add))
+            if _LEVEL.get() <= logging.DEBUG and log.isEnabledFor(logging.DEBUG):
+                log.debug("  %s", ellipsize(add))
 
         log.info("  ---")
 
     if not fast:
-        N_removed = sum(len(d) for d in dump.values())
-        log.info(f"{N_removed} total rows removed")
-
-    # Add units to the Platform before adding data
-    for unit in spec["add"].set["unit"]:
-        unit = unit if isinstance(unit, Code) else Code(id=unit, name=unit)
-        _add_unit(scenario.platform, unit.id, str(unit.name))
+        log.info("%d total rows removed", N_removed)
+
+    # Add units to the Platform before adding data. Collect distinct units first, then
+    # skip any that already exist on the platform.
+    units: dict[str, Code] = {}
+    for unit in [
+        u if isinstance(u, Code) else Code(id=u, name=u)
+        for u in spec["add"].set.get("unit", [])
+    ]:
+        units.setdefault(unit.id, unit)
+    if units:
+        existing = set(scenario.platform.units())
+        for unit in filter(lambda u: u.id not in existing, units.values()):
+            _add_unit(scenario.platform, unit.id, str(unit.name))
 
     # Add data
     if callable(data):
@@ -1,15 +1,17 @@
-from typing import Any, cast
+from functools import lru_cache
+from typing import Any, Optional, cast
 
 import message_ix
-import numpy as np
 import pandas as pd
 from message_ix import make_df
+from packaging.version import parse
 
 from message_ix_models import ScenarioInfo
 from message_ix_models.model.material.material_demand import material_demand_calc
 from message_ix_models.model.material.util import maybe_remove_water_tec, read_config
 from message_ix_models.util import (
     broadcast,
+    cached,
     nodes_ex_world,
     package_data_path,
     same_node,
@@ -17,6 +19,15 @@ from message_ix_models.util import (
 
 CONVERSION_FACTOR_NH3_N = 17 / 14
 
+try:
+    import python_calamine  # noqa: F401
+except ImportError:
+    #: Engine for reading input workbooks: "calamine" if :mod:`python_calamine` is
+    #: installed and supported by :mod:`pandas` (≥ 2.2), else the :mod:`pandas` default.
+    EXCEL_ENGINE: Optional[str] = None
+else:
+    EXCEL_ENGINE = "calamine" if parse(pd.__version__) >= parse("2.2") else None
+
 ssp_mode_map = {
     "SSP1": "CTS core",
     "SSP2": "RTS core",
@@ -34,6 +45,29 @@ iea_elasticity_map = {
 }
 
 
+@cached
+def _read_excel_cached(
+    path: str, mtime: float, engine: Optional[str], **kwargs
+) -> pd.DataFrame:
+    """Read a sheet from the Excel file at `path` using `engine`.
+
+    `mtime` is not used, but is part of the cache key, so that cached data are not used
+    after the file at `path` is modified.
+    """
+    with pd.ExcelFile(path, engine=engine) as xf:
+        return xf.parse(**kwargs)
+
+
+def _read_excel(filename: str, **kwargs) -> pd.DataFrame:
+    """Read a sheet from `filename` in :file:`data/material/ammonia/`.
+
+    On the first call for a given file and `kwargs`, the parsed data are cached, so the
+    Excel file is not parsed again.
+    """
+    path = package_data_path("material", "ammonia", filename)
+    return _read_excel_cached(str(path), path.stat().st_mtime, EXCEL_ENGINE, **kwargs)
+
+
 def gen_all_NH3_fert(
     scenario: message_ix.Scenario, dry_run: bool = False
 ) -> dict[str, pd.DataFrame]:
@@ -54,12 +88,8 @@ def broadcast_years(
         df_new = df_new.pipe(same_node).pipe(broadcast, year_act=act_years)
 
         if "year_vtg" in df_new.columns:
-            df_new = df_new.pipe(
-                broadcast,
-                year_vtg=np.linspace(
-                    0, int(max_lt / 5), int(max_lt / 5 + 1), dtype=int
-                ),
-            )
+            # Offsets of 0, 1, …, max_lt / 5 periods of 5 years before year_act
+            df_new = df_new.pipe(broadcast, year_vtg=range(int(max_lt / 5) + 1))
             df_new["year_vtg"] = df_new["year_act"] - 5 * df_new["year_vtg"]
             # remove years that are not in scenario set
             df_new = df_new[~df_new["year_vtg"].isin([2065, 2075, 2085, 2095, 2105])]
@@ -79,12 +109,8 @@ def gen_data(
     # s_info.yv_ya
     nodes = nodes_ex_world(s_info.N)
 
-    df = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "fert_techno_economic.xlsx",
-        ),
+    df = _read_excel(
+        "fert_techno_economic.xlsx",
         sheet_name="data_R12",
     )
 
@@ -92,16 +118,15 @@ def gen_data(
     for i in par_dict.keys():
         par_dict[i] = par_dict[i].dropna(axis=1)
 
-    vtg_years = s_info.yv_ya[s_info.yv_ya.year_vtg > 2000]["year_vtg"]
-    act_years = s_info.yv_ya[s_info.yv_ya.year_vtg > 2000]["year_act"]
+    yv_ya = s_info.yv_ya.query("year_vtg > 2000")
+    vtg_years = yv_ya["year_vtg"].drop_duplicates()
+    act_years = yv_ya["year_act"].drop_duplicates()
     max_lt = par_dict["technical_lifetime"].value.max()
-    vtg_years = vtg_years.drop_duplicates()
-    act_years = act_years.drop_duplicates()
 
     for par_name in par_dict.keys():
         df = par_dict[par_name]
         # remove "default" node name to broadcast with all scenario regions later
-        df["node_loc"] = df["node_loc"].apply(lambda x: None if x == "default" else x)
+        df["node_loc"] = df["node_loc"].mask(df["node_loc"] == "default")
         df = df.to_dict()
 
         df_new = make_df(par_name, **df)
@@ -134,7 +159,7 @@ def gen_data(
 
     dict_lifetime = missingdict(dict_lifetime)
     for i in par_dict.keys():
-        if ("year_vtg" in par_dict[i].columns) & ("year_act" in par_dict[i].columns):
+        if {"year_vtg", "year_act"} <= set(par_dict[i].columns):
             df_temp = par_dict[i]
             df_temp["lifetime"] = df_temp["technology"].map(dict_lifetime)
             df_temp = df_temp[
@@ -153,29 +178,27 @@ def gen_data(
         "coal_NH3_ccs",
         "fueloil_NH3_ccs",
     ]
-    cost_conv = pd.read_excel(
-        package_data_path("material", "ammonia", "cost_conv_nh3.xlsx"),
+    cost_conv = _read_excel(
+        "cost_conv_nh3.xlsx",
         sheet_name="Sheet1",
         index_col=0,
     )
     for p in pars:
-        conv_cost_df = pd.DataFrame()
         df = par_dict[p]
-        for tec in tec_list:
-            year_col = "year_vtg" if p == "inv_cost" else "year_act"
-
-            df_tecs = df[df["technology"] == tec]
-            df_tecs = df_tecs.merge(cost_conv, left_on=year_col, right_index=True)
-            df_tecs_nam = df_tecs[df_tecs["node_loc"] == "R12_NAM"]
-            df_tecs = df_tecs.merge(
-                df_tecs_nam[[year_col, "value"]], left_on=year_col, right_on=year_col
-            )
-            df_tecs["diff"] = df_tecs["value_x"] - df_tecs["value_y"]
-            df_tecs["diff"] = df_tecs["diff"] * (1 - df_tecs["convergence"])
-            df_tecs["new_val"] = df_tecs["value_x"] - df_tecs["diff"]
-            df_tecs["value"] = df_tecs["new_val"]
-            conv_cost_df = pd.concat([conv_cost_df, make_df(p, **df_tecs)])
-        par_dict[p] = pd.concat([df[~df["technology"].isin(tec_list)], conv_cost_df])
+        year_col = "year_vtg" if p == "inv_cost" else "year_act"
+        mask = df["technology"].isin(tec_list)
+
+        # Converge costs of all technologies in `tec_list` towards those in R12_NAM
+        df_tecs = df[mask].merge(cost_conv, left_on=year_col, right_index=True)
+        df_tecs_nam = df_tecs[df_tecs["node_loc"] == "R12_NAM"]
+        df_tecs = df_tecs.merge(
+            df_tecs_nam[["technology", year_col, "value"]], on=["technology", year_col]
+        )
+        df_tecs["diff"] = df_tecs["value_x"] - df_tecs["value_y"]
+        df_tecs["diff"] = df_tecs["diff"] * (1 - df_tecs["convergence"])
+        df_tecs["value"] = df_tecs["value_x"] - df_tecs["diff"]
+
+        par_dict[p] = pd.concat([df[~mask], make_df(p, **df_tecs)])
 
     # HACK: quick fix to enable compatibility with water build
     maybe_remove_water_tec(scenario, par_dict)
@@ -186,32 +209,22 @@ def gen_data(
 def gen_data_rel(scenario, dry_run=False, add_ccs: bool = True):
     s_info = ScenarioInfo(scenario)
     # s_info.yv_ya
-    nodes = s_info.N
-    if "World" in nodes:
-        nodes.pop(nodes.index("World"))
-    if "R12_GLB" in nodes:
-        nodes.pop(nodes.index("R12_GLB"))
-
-    df = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "fert_techno_economic.xlsx",
-        ),
+    nodes = nodes_ex_world(s_info.N)
+
+    df = _read_excel(
+        "fert_techno_economic.xlsx",
         sheet_name="relations_R12",
     )
-    df.groupby("parameter")
     par_dict = {key: value for (key, value) in df.groupby("parameter")}
     # for i in par_dict.keys():
     # par_dict[i] = par_dict[i].dropna(axis=1)
 
-    act_years = s_info.yv_ya[s_info.yv_ya.year_vtg > 2000]["year_act"]
-    act_years = act_years.drop_duplicates()
+    act_years = s_info.yv_ya.query("year_vtg > 2000")["year_act"].drop_duplicates()
 
     for par_name in par_dict.keys():
         df = par_dict[par_name]
         # remove "default" node name to broadcast with all scenario regions later
-        df["node_rel"] = df["node_rel"].apply(lambda x: None if x == "all" else x)
+        df["node_rel"] = df["node_rel"].mask(df["node_rel"] == "all")
         df_dict = cast(dict[str, Any], df.to_dict())
         df = make_df(par_name, **df_dict)
         # split df into df with default values and df with regionalized values
@@ -221,17 +234,17 @@ def gen_data_rel(scenario, dry_run=False, add_ccs: bool = True):
         # broadcast regions to default parameter values
         df_all_regs = df_all_regs.pipe(broadcast, node_rel=nodes)
 
-        def same_node_if_nan(df):
-            if df["node_loc"] == "same":
-                df["node_loc"] = df["node_rel"]
-            return df
-
         if "node_loc" in df_all_regs.columns:
-            df_all_regs = df_all_regs.apply(lambda x: same_node_if_nan(x), axis=1)
+            # Replace node_loc="same" with the value of node_rel
+            df_all_regs = df_all_regs.assign(
+                node_loc=df_all_regs["node_loc"].mask(
+                    df_all_regs["node_loc"] == "same", df_all_regs["node_rel"]
+                )
+            )
 
         if "node_loc" in df_single_regs.columns:
-            df_single_regs["node_loc"] = df_single_regs["node_loc"].apply(
-                lambda x: None if x == "all" else x
+            df_single_regs["node_loc"] = df_single_regs["node_loc"].mask(
+                df_single_regs["node_loc"] == "all"
             )
             df_new_reg_all_regs = df_single_regs.copy(deep=True).loc[
                 df_single_regs["node_loc"].isna()
@@ -265,18 +278,10 @@ def gen_data_ts(
 ) -> dict[str, pd.DataFrame]:
     s_info = ScenarioInfo(scenario)
     # s_info.yv_ya
-    nodes = s_info.N
-    if "World" in nodes:
-        nodes.pop(nodes.index("World"))
-    if "R12_GLB" in nodes:
-        nodes.pop(nodes.index("R12_GLB"))
-
-    df = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "fert_techno_economic.xlsx",
-        ),
+    nodes = nodes_ex_world(s_info.N)
+
+    df = _read_excel(
+        "fert_techno_economic.xlsx",
         sheet_name="timeseries_R12",
     )
     df["year_act"] = df["year_act"].astype("Int64")
@@ -288,7 +293,7 @@ def gen_data_ts(
     for par_name in par_dict.keys():
         df = par_dict[par_name]
         # remove "default" node name to broadcast with all scenario regions later
-        df["node_loc"] = df["node_loc"].apply(lambda x: None if x == "default" else x)
+        df["node_loc"] = df["node_loc"].mask(df["node_loc"] == "default")
         df = df.to_dict()
 
         df_new = make_df(par_name, **df)
@@ -326,34 +331,34 @@ def set_exp_imp_nodes(df: pd.DataFrame) -> None:
 
 def read_demand() -> dict[str, pd.DataFrame]:
     """Read and clean data from
-    :file:`CD-Links SSP2 N-fertilizer demand.Global.xlsx`."""
+    :file:`CD-Links SSP2 N-fertilizer demand.Global.xlsx`.
+
+    The data are read once; each call returns copies that callers may modify.
+    """
+    return {k: v.copy() for k, v in _read_demand().items()}
+
+
+@lru_cache
+def _read_demand() -> dict[str, pd.DataFrame]:
+    """Implementation of :func:`read_demand`; the return value is cached."""
     # Demand scenario [Mt N/year] from GLOBIOM
 
-    N_demand_GLO = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "nh3_fertilizer_demand.xlsx",
-        ),
+    N_demand_GLO = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="NFertilizer_demand",
     )
 
     # NH3 feedstock share by region in 2010 (from http://ietd.iipnetwork.org/content/ammonia#benchmarks)
-    feedshare_GLO = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "nh3_fertilizer_demand.xlsx",
-        ),
+    feedshare_GLO = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="NH3_feedstock_share",
         skiprows=14,
     )
 
     # Read parameters in xlsx
-    te_params = pd.read_excel(
-        package_data_path("material", "ammonia", "nh3_fertilizer_demand.xlsx"),
+    te_params = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="old_TE_sheet",
-        engine="openpyxl",
         nrows=72,
     )
 
@@ -373,38 +378,30 @@ def read_demand() -> dict[str, pd.DataFrame]:
     ND.Region = "R12_" + ND.Region
     ND = ND.set_index("Region")
 
+    # Energy input (GWa) of gas, coal, and oil per unit of N produced; NH3 / N
+    fuel_per_N = input_fuel[[2, 3, 4]].to_numpy() * CONVERSION_FACTOR_NH3_N
+
+    def total_energy(fs: pd.DataFrame, N: pd.Series) -> pd.DataFrame:
+        """Total energy (GWa) of NH3 production in each region of `fs`.
+
+        `N` is the N quantity in each region.
+        """
+        energy = (
+            fs[["gas_pct", "coal_pct", "oil_pct"]]
+            .mul(N.reindex(fs.Region).to_numpy(), axis="index")
+            .mul(fuel_per_N)
+        )
+        return pd.DataFrame({"node": fs.Region, "totENE": energy.sum(axis=1)})
+
     # Derive total energy (GWa) of NH3 production (based on demand 2010)
-    N_energy = feedshare_GLO[feedshare_GLO.Region != "R12_GLB"].join(ND, on="Region")
-    N_energy = pd.concat(
-        [
-            N_energy.Region,
-            N_energy[["gas_pct", "coal_pct", "oil_pct"]].multiply(
-                N_energy[2010], axis="index"
-            ),
-        ],
-        axis=1,
-    )
-    N_energy.gas_pct *= input_fuel[2] * CONVERSION_FACTOR_NH3_N  # NH3 / N
-    N_energy.coal_pct *= input_fuel[3] * CONVERSION_FACTOR_NH3_N
-    N_energy.oil_pct *= input_fuel[4] * CONVERSION_FACTOR_NH3_N
-    N_energy = pd.concat(
-        [N_energy.Region, N_energy.sum(axis=1, numeric_only=True)], axis=1
-    ).rename(columns={0: "totENE", "Region": "node"})  # GWa
-
-    # N_trade_R12 = pd.read_csv(
-    #    package_data_path("material", "ammonia", "trade.FAO.R12.csv"), index_col=0
-    # )
-    N_trade_R12 = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "nh3_fertilizer_demand.xlsx",
-        ),
+    N_energy = total_energy(feedshare_GLO[feedshare_GLO.Region != "R12_GLB"], ND[2010])
+
+    N_trade_R12 = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="NFertilizer_trade",
-    )  # , index_col=0)
+    )
 
     N_trade_R12.region = "R12_" + N_trade_R12.region
-    N_trade_R12.quantity = N_trade_R12.quantity
     N_trade_R12.unit = "t"
     N_trade_R12 = N_trade_R12.assign(time="year")
     N_trade_R12 = N_trade_R12.rename(
@@ -420,17 +417,8 @@ def read_demand() -> dict[str, pd.DataFrame]:
     NP = pd.DataFrame({"netimp": df["import"] - df.export, "demand": ND[2010]})
     NP["prod"] = NP.demand - NP.netimp
 
-    # NH3_trade_R12 = pd.read_csv(
-    #    package_data_path(
-    #        "material", "ammonia", "NH3_trade_BACI_R12_aggregation.csv"
-    #    )
-    # )  # , index_col=0)
-    NH3_trade_R12 = pd.read_excel(
-        package_data_path(
-            "material",
-            "ammonia",
-            "nh3_fertilizer_demand.xlsx",
-        ),
+    NH3_trade_R12 = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="NH3_trade_R12_aggregated",
     )
 
@@ -447,22 +435,7 @@ def read_demand() -> dict[str, pd.DataFrame]:
     )
 
     # Derive total energy (GWa) of NH3 production (based on demand 2010)
-    N_feed = feedshare_GLO[feedshare_GLO.Region != "R11_GLB"].join(NP, on="Region")
-    N_feed = pd.concat(
-        [
-            N_feed.Region,
-            N_feed[["gas_pct", "coal_pct", "oil_pct"]].multiply(
-                N_feed["prod"], axis="index"
-            ),
-        ],
-        axis=1,
-    )
-    N_feed.gas_pct *= input_fuel[2] * 17 / 14
-    N_feed.coal_pct *= input_fuel[3] * 17 / 14
-    N_feed.oil_pct *= input_fuel[4] * 17 / 14
-    N_feed = pd.concat(
-        [N_feed.Region, N_feed.sum(axis=1, numeric_only=True)], axis=1
-    ).rename(columns={0: "totENE", "Region": "node"})
+    N_feed = total_energy(feedshare_GLO[feedshare_GLO.Region != "R11_GLB"], NP["prod"])
 
     # Process the regional historical activities
 
@@ -483,15 +456,8 @@ def read_demand() -> dict[str, pd.DataFrame]:
     N_demand_raw = N_demand_GLO[N_demand_GLO["Region"] != "World"].copy()
     N_demand_raw["Region"] = "R12_" + N_demand_raw["Region"]
     N_demand_raw = N_demand_raw.set_index("Region")
-    N_demand = (
-        N_demand_raw.loc[
-            (N_demand_raw.Scenario == "NoPolicy")  # & (N_demand_raw.Region != "World")
-        ]
-        # .reset_index()
-        .loc[:, 2010]
-    )  # 2010 tot N demand
-    # N_demand = N_demand.repeat(6)
-    # act2010 = (feedshare.values.flatten() * N_demand).reset_index(drop=True)
+    # 2010 tot N demand
+    N_demand = N_demand_raw.loc[N_demand_raw.Scenario == "NoPolicy", 2010]
 
     return {
         "act2010": feedshare.mul(N_demand, axis=0),
@@ -499,7 +465,6 @@ def read_demand() -> dict[str, pd.DataFrame]:
         "ND": ND,
         "N_energy": N_energy,
         "feedshare": feedshare,
-        # "act2010": act2010,
         "capacity_factor": capacity_factor,
         "N_feed": N_feed,
         "N_trade_R12": N_trade_R12,
@@ -510,8 +475,8 @@ def read_demand() -> dict[str, pd.DataFrame]:
 def gen_demand() -> dict[str, pd.DataFrame]:
     N_energy = read_demand()["N_feed"]  # updated feed with imports accounted
 
-    demand_fs_org = pd.read_excel(
-        package_data_path("material", "ammonia", "nh3_fertilizer_demand.xlsx"),
+    demand_fs_org = _read_excel(
+        "nh3_fertilizer_demand.xlsx",
         sheet_name="demand_i_feed_R12",
     )
 
@@ -561,18 +526,23 @@ def experiment_lower_CPA_SAS_costs(par_dict: dict) -> dict[str, pd.DataFrame]:
         "R12_SAS": [0.59, 1],
     }
     tec_list = ["fueloil_NH3", "coal_NH3"]
+
+    # Scaling factors indexed by (node_loc, technology), including CCS variants
+    factor = pd.Series(
+        {
+            (n, t + suffix): values[e]
+            for n, values in scaler.items()
+            for e, t in enumerate(tec_list)
+            for suffix in ("", "_ccs")
+        }
+    )
+
     for c in cost_list:
         df = par_dict[c]
-        for k in scaler.keys():
-            df_tmp = df.loc[df["node_loc"] == k]
-            for e, t in enumerate(tec_list):
-                df_tmp.loc[df_tmp["technology"] == t, "value"] = df_tmp.loc[
-                    df_tmp["technology"] == t, "value"
-                ].mul(scaler.get(k)[e])
-                df_tmp.loc[df_tmp["technology"] == t + "_ccs", "value"] = df_tmp.loc[
-                    df_tmp["technology"] == t + "_ccs", "value"
-                ].mul(scaler.get(k)[e])
-            df.loc[df["node_loc"] == k] = df_tmp
-        par_dict[c] = df
+        # Look up the factor for every row at once; 1.0 for other nodes/technologies
+        idx = pd.MultiIndex.from_frame(df[["node_loc", "technology"]])
+        par_dict[c] = df.assign(
+            value=df["value"] * factor.reindex(idx, fill_value=1.0).to_numpy()
+        )
 
     return par_dict
@@ -131,6 +131,21 @@ def add_macro_COVID(
     return scen
 
 
+def _deduct_regional_share(
+    df: pd.DataFrame, node: str, share: pd.DataFrame, col: str, region_type: str
+) -> None:
+    """Multiply ``value`` in `df` in place by 1 minus the regional `share`.
+
+    `share` has region IDs without the `region_type` prefix in a "REGION" column and
+    the share in `col`. Rows of `df` with other values in the `node` column are
+    unchanged. A missing share gives a missing ``value``.
+    """
+    factor = share.set_index(region_type + share["REGION"])[col].astype(float)
+    # Only rows for regions in `share`; missing values of `col` propagate
+    mask = df[node].isin(factor.index)
+    df.loc[mask, "value"] *= 1 - df.loc[mask, node].map(factor)
+
+
 def modify_demand_and_hist_activity(scen: message_ix.Scenario) -> None:
     """Take care of demand changes due to the introduction of material parents
     Shed industrial energy demand properly.
@@ -333,42 +348,14 @@ def modify_demand_and_hist_activity(scen: message_ix.Scenario) -> None:
     useful_spec = scen.par("demand", filters={"commodity": "i_spec"})
     useful_feed = scen.par("demand", filters={"commodity": "i_feed"})
 
-    for r in df_therm_new["REGION"]:
-        r_MESSAGE = region_type + r
-
-        useful_thermal.loc[useful_thermal["node"] == r_MESSAGE, "value"] = (
-            useful_thermal.loc[useful_thermal["node"] == r_MESSAGE, "value"]
-            * (1 - df_therm_new.loc[df_therm_new["REGION"] == r, "i_therm"].values[0])
-        )
-
-        thermal_df_hist.loc[thermal_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            thermal_df_hist.loc[thermal_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_therm_new.loc[df_therm_new["REGION"] == r, "i_therm"].values[0])
-        )
-
-    for r in df_spec_new["REGION"]:
-        r_MESSAGE = region_type + r
-
-        useful_spec.loc[useful_spec["node"] == r_MESSAGE, "value"] = useful_spec.loc[
-            useful_spec["node"] == r_MESSAGE, "value"
-        ] * (1 - df_spec_new.loc[df_spec_new["REGION"] == r, "i_spec"].values[0])
-
-        spec_df_hist.loc[spec_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            spec_df_hist.loc[spec_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_spec_new.loc[df_spec_new["REGION"] == r, "i_spec"].values[0])
-        )
+    for df, node in ((useful_thermal, "node"), (thermal_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_therm_new, "i_therm", region_type)
 
-    for r in df_feed_new["REGION"]:
-        r_MESSAGE = region_type + r
+    for df, node in ((useful_spec, "node"), (spec_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_spec_new, "i_spec", region_type)
 
-        useful_feed.loc[useful_feed["node"] == r_MESSAGE, "value"] = useful_feed.loc[
-            useful_feed["node"] == r_MESSAGE, "value"
-        ] * (1 - df_feed_new.loc[df_feed_new["REGION"] == r, "i_feed"].values[0])
-
-        feed_df_hist.loc[feed_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            feed_df_hist.loc[feed_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_feed_new.loc[df_feed_new["REGION"] == r, "i_feed"].values[0])
-        )
+    for df, node in ((useful_feed, "node"), (feed_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_feed_new, "i_feed", region_type)
 
     scen.check_out()
     scen.add_par("demand", useful_thermal)
@@ -655,42 +642,14 @@ def modify_demand_and_hist_activity_debug(
     useful_spec = scen.par("demand", filters={"commodity": "i_spec"})
     useful_feed = scen.par("demand", filters={"commodity": "i_feed"})
 
-    for r in df_therm_new["REGION"]:
-        r_MESSAGE = region_type + r
-
-        useful_thermal.loc[useful_thermal["node"] == r_MESSAGE, "value"] = (
-            useful_thermal.loc[useful_thermal["node"] == r_MESSAGE, "value"]
-            * (1 - df_therm_new.loc[df_therm_new["REGION"] == r, "i_therm"].values[0])
-        )
-
-        thermal_df_hist.loc[thermal_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            thermal_df_hist.loc[thermal_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_therm_new.loc[df_therm_new["REGION"] == r, "i_therm"].values[0])
-        )
-
-    for r in df_spec_new["REGION"]:
-        r_MESSAGE = region_type + r
-
-        useful_spec.loc[useful_spec["node"] == r_MESSAGE, "value"] = useful_spec.loc[
-            useful_spec["node"] == r_MESSAGE, "value"
-        ] * (1 - df_spec_new.loc[df_spec_new["REGION"] == r, "i_spec"].values[0])
-
-        spec_df_hist.loc[spec_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            spec_df_hist.loc[spec_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_spec_new.loc[df_spec_new["REGION"] == r, "i_spec"].values[0])
-        )
-
-    for r in df_feed_new["REGION"]:
-        r_MESSAGE = region_type + r
+    for df, node in ((useful_thermal, "node"), (thermal_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_therm_new, "i_therm", region_type)
 
-        useful_feed.loc[useful_feed["node"] == r_MESSAGE, "value"] = useful_feed.loc[
-            useful_feed["node"] == r_MESSAGE, "value"
-        ] * (1 - df_feed_new.loc[df_feed_new["REGION"] == r, "i_feed"].values[0])
+    for df, node in ((useful_spec, "node"), (spec_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_spec_new, "i_spec", region_type)
 
-        feed_df_hist.loc[feed_df_hist["node_loc"] == r_MESSAGE, "value"] = (
-            feed_df_hist.loc[feed_df_hist["node_loc"] == r_MESSAGE, "value"]
-            * (1 - df_feed_new.loc[df_feed_new["REGION"] == r, "i_feed"].values[0])
-        )
+    for df, node in ((useful_feed, "node"), (feed_df_hist, "node_loc")):
+        _deduct_regional_share(df, node, df_feed_new, "i_feed", region_type)
 
     # For aluminum there is no significant deduction required
     # (refining process not included and thermal energy required from
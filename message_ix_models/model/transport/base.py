@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any, Optional
 import genno
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from genno import Computer, KeySeq
 from genno.core.key import single_key
 
@@ -23,6 +25,9 @@ if TYPE_CHECKING:
 #: Key to trigger the computations set up by :func:`.prepare_computer`
 RESULT_KEY = "base model data"
 
+#: Minimum length of a data frame sorted with :mod:`pyarrow` rather than :mod:`numpy`.
+_SORT_ARROW_MIN = 50_000
+
 FE_HEADER = """Final energy input to transport technologies.
 
 Units: GWa
@@ -325,8 +330,7 @@ def prepare_reporter(rep: "message_ix.Reporter") -> str:
 
         # Sort values
         # TODO Move upstream as a feature of as_message_df()
-        dims = list(args["dims"])
-        rep.add(key + "1", partial(pd.DataFrame.sort_values, by=dims), key)
+        rep.add(key + "1", partial(_sort, by=tuple(args["dims"])), key)
 
         # Header for this file
         rep.add(k_header, "base_model_data_header", "scenario", name=name)
@@ -336,6 +340,32 @@ def prepare_reporter(rep: "message_ix.Reporter") -> str:
     return RESULT_KEY
 
 
+def _sort(df: pd.DataFrame, by: tuple[str, ...]) -> pd.DataFrame:
+    """Sort `df` by the columns `by`, in order.
+
+    Same result as :meth:`pandas.DataFrame.sort_values`, including missing values
+    placed last, using a single stable sort over the key columns:
+    :func:`numpy.lexsort` of factorized keys, or :func:`pyarrow.compute.sort_indices`
+    for frames of at least :data:`_SORT_ARROW_MIN` rows.
+    """
+    if len(df) >= _SORT_ARROW_MIN:
+        table = pa.Table.from_pandas(df[list(by)], preserve_index=False)
+        order = pc.sort_indices(
+            table,
+            sort_keys=[(col, "ascending") for col in by],
+            null_placement="at_end",
+        )
+        return df.take(order.to_numpy())
+
+    keys = []
+    for col in reversed(by):
+        # Sorted integer codes; missing values (code -1) sort after all others
+        codes, uniques = pd.factorize(df[col], sort=True)
+        keys.append(np.where(codes < 0, len(uniques), codes))
+
+    return df.take(np.lexsort(keys))
+
+
 def share_constraints(c: Computer, k_fe: "genno.Key", k_ue: "genno.Key") -> None:
     """ """
     from genno import Key
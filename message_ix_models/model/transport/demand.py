@@ -10,8 +10,6 @@ from dask.core import literal
 from genno import Computer, KeySeq
 from message_ix import make_df
 
-from message_ix_models.util import broadcast
-
 from . import files as exo
 from .key import (
     cg,
@@ -63,24 +61,30 @@ def dummy(
         # No dummy data → return nothing
         return dict()
 
-    common = dict(level="useful", time="year", value=10 + np.arange(len(y)), year=y)
-
-    dfs = []
-
-    for commodity in commodities:
-        try:
-            commodity.get_annotation(id="demand")
-        except (AttributeError, KeyError):
-            continue  # Not a demand commodity
-
-        unit = "t km" if "freight" in commodity.id else "km"
-        dfs.append(make_df("demand", commodity=commodity.id, unit=unit, **common))
-
-    # # Dummy demand for light oil
-    # common["level"] = "final"
-    # dfs.append(make_df("demand", commodity="lightoil", **common))
-
-    return dict(demand=pd.concat(dfs).pipe(broadcast, node=nodes))
+    # IDs of demand commodities: those with a "demand" annotation. Plain str elements
+    # of `commodities` have no annotations.
+    ids = [
+        c.id
+        for c in commodities
+        if any(a.id == "demand" for a in getattr(c, "annotations", ()))
+    ]
+
+    # One row per (commodity, node, year), constructed at once
+    idx = pd.MultiIndex.from_product(
+        [ids, nodes, y], names=["commodity", "node", "year"]
+    )
+    is_freight = np.char.find(np.array(ids, dtype=str), "freight") >= 0
+    units = np.where(is_freight, "t km", "km")
+    data = make_df(
+        "demand",
+        **{dim: idx.get_level_values(dim) for dim in idx.names},
+        level="useful",
+        time="year",
+        value=np.tile(10 + np.arange(len(y)), len(ids) * len(nodes)),
+        unit=np.repeat(units, len(nodes) * len(y)),
+    )
+
+    return dict(demand=data)
 
 
 # Common keyword args to as_message_df()
@@ -91,7 +95,7 @@ _DEMAND_KW = dict(
 )
 
 #: Task for computing and adding demand data; inputs to :meth:`.Computer.add_queue`.
-TASKS = [
+TASKS = (
     # Values based on configuration
     # Disabled for #551
     # (("speed:t", "quantity_from_config", "config"), dict(name="speeds")),
@@ -212,7 +216,7 @@ TASKS = [
         "demand::F+ixmp",
         "demand::dummy+ixmp",
     ),
-]
+)
 
 
 def pdt_per_capita(c: Computer) -> None:
@@ -418,9 +418,10 @@ def dummy_prices(gdp: "AnyQuantity") -> "AnyQuantity":
     coords.append(("c", ["transport"]))
     shape = list(len(c[1]) for c in coords)
 
-    return genno.Quantity(
-        xr.DataArray(np.full(shape, 0.1), coords=coords), units="USD / km"
-    )
+    # Broadcast a scalar instead of allocating a filled array of `shape`
+    data = np.broadcast_to(np.float64(0.1), shape)
+
+    return genno.Quantity(xr.DataArray(data, coords=coords), units="USD / km")
 
 
 def duration_period(info: "ScenarioInfo") -> "AnyQuantity":
@@ -586,8 +587,8 @@ def factor_pdt(n: list[str], y: list[int], t: list[str], config: dict) -> "AnyQu
     """
     from message_ix_models.util import broadcast
 
-    # Empty data frame
-    df = pd.DataFrame(columns=t, index=pd.Index(y, name="y"))
+    # Empty data frame of float64, so that values need no dtype inference later
+    df = pd.DataFrame(np.nan, columns=t, index=pd.Index(y, name="y"))
 
     # Set 1.0 (no scaling) for first period
     df.iloc[0, :] = 1.0
@@ -603,8 +604,7 @@ def factor_pdt(n: list[str], y: list[int], t: list[str], config: dict) -> "AnyQu
     # - Broadcast over all nodes `n`.
     # - Set dimensions as index.
     return genno.Quantity(
-        df.infer_objects()
-        .ffill()
+        df.ffill()
         .reset_index()
         .melt(id_vars="y", var_name="t")
         .assign(n=None)
@@ -1162,7 +1162,8 @@ def transport_data(*args):
 
 def transport_check(scenario: "Scenario", ACT: "AnyQuantity") -> pd.Series:
     """Reporting operator for :func:`.check`."""
-    info = ScenarioInfo(scenario)
+    # Only the "node" and "year" sets are needed; don't copy every set of `scenario`
+    info = ScenarioInfo.from_scenario_sets(scenario, ("node", "year"))
 
     # Mapping from check name → bool
     checks = {}
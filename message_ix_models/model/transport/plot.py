@@ -1,11 +1,14 @@
 """Plots for MESSAGEix-Transport reporting."""
 
 import logging
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
 import genno.compat.plotnine
+import numpy as np
 import pandas as pd
 import plotnine as p9
 from genno import Computer
@@ -68,8 +71,11 @@ class Plot(genno.compat.plotnine.Plot):
     #: :obj:`False` for plots not intended to be run on a solved scenario.
     runs_on_solved_scenario: bool = True
 
-    def ggtitle(self, extra: Optional[str] = None):
-        """Return :class:`plotnine.ggtitle` including the current date & time."""
+    def ggtitle(self, extra: Optional[str] = None, now: Optional[str] = None):
+        """Return :class:`plotnine.ggtitle` including the current date & time.
+
+        If `now` is given, it is used instead of formatting the current date & time.
+        """
         title_parts = [
             (self.title or self.__doc__ or "").splitlines()[0].rstrip("."),
             f"[{self.unit}]" if self.unit else None,
@@ -78,7 +84,7 @@ class Plot(genno.compat.plotnine.Plot):
         subtitle_parts = [
             getattr(self.scenario, "url", "no Scenario"),
             "—",
-            datetime.now().isoformat(timespec="minutes"),
+            now or datetime.now().isoformat(timespec="minutes"),
         ]
         return p9.labs(
             title=" ".join(filter(None, title_parts)), subtitle=" ".join(subtitle_parts)
@@ -90,13 +96,19 @@ class Plot(genno.compat.plotnine.Plot):
         Groups by `args` and yields a series of :class:`plotnine.ggplot` objects, one
         per group, with :attr:`static` geoms and :func:`ggtitle` appended to each.
         """
-        for group_key, group_df in data.groupby(*args):
+        # Scalar group keys for a single dimension, as in earlier versions
+        by = args[0] if len(args) == 1 else list(args)
+
+        # Same date & time on every page
+        now = datetime.now().isoformat(timespec="minutes")
+
+        for group_key, group_df in data.groupby(by, sort=True, observed=True):
             yield (
                 group_key,
                 (
                     p9.ggplot(group_df)
                     + self.static
-                    + self.ggtitle(f"{'-'.join(args)}={group_key!r}")
+                    + self.ggtitle(f"{'-'.join(args)}={group_key!r}", now)
                 ),
             )
 
@@ -169,25 +181,44 @@ class CapNewLDV(Plot):
 
     def generate(self, data0, data1):
         # - Concatenate data0 (values in "historical_new_capacity" column) and
-        #   data1 (values in "CAP_NEW" column).
+        #   data1 (values in "CAP_NEW" column), both renamed to "value".
         # - Fill with zeros.
-        # - Compute a "value" column: one or the other.
         # - Remove some errant values for R12_GLB.
         #   FIXME Investigate and remove the source
         data = (
-            pd.concat([data0, data1])
-            .fillna(0)
-            .eval("value = CAP_NEW + historical_new_capacity")
+            pd.concat(
+                [
+                    data0.rename(columns={"historical_new_capacity": "value"}),
+                    data1.rename(columns={"CAP_NEW": "value"}),
+                ]
+            )
+            .fillna({"value": 0})
             .query("nl != 'R12_GLB'")
         )
 
         yield from [ggplot for _, ggplot in self.groupby_plot(data, "nl")]
 
 
+def _share(data: pd.DataFrame, by: list[str], col: str = "value") -> pd.Series:
+    """Return `col` in `data` as a share of its total within groups of `by`."""
+    return data[col] / data.groupby(by, sort=False, observed=True)[col].transform("sum")
+
+
+@lru_cache(maxsize=32)
+def _read_csv(path: Path, mtime_ns: int, **kwargs) -> pd.DataFrame:
+    """Read `path`; cached on the modification time `mtime_ns` of the file.
+
+    Only the most recently used files are kept, so that data from earlier versions of a
+    modified file are eventually released.
+    """
+    return pd.read_csv(path, **kwargs)
+
+
 def read_csvs(stem: str, *paths: Path, **kwargs) -> pd.DataFrame:
     """Read and concatenate data for debugging plots.
 
-    - Read data from files named :file:`{stem}.csv` in each of `paths`.
+    - Read data from files named :file:`{stem}.csv` in each of `paths`. The contents
+      of each file are cached until it is modified.
     - Store with shortened scenario labels extracted from the `paths`.
     - Concatenate to a single data frame with a "scenario" column.
     """
@@ -197,13 +228,15 @@ def read_csvs(stem: str, *paths: Path, **kwargs) -> pd.DataFrame:
         return dirname.parts[-1].split("ICONICS_", maxsplit=1)[-1]
 
     kwargs.setdefault("comment", "#")
-    return pd.concat(
-        {
-            label_from(p): pd.read_csv(p.joinpath(f"{stem}.csv"), **kwargs)
-            for p in paths
-        },
-        names=["scenario"],
-    ).reset_index("scenario")
+    dfs = []
+    for p in paths:
+        path = p.joinpath(f"{stem}.csv")
+        # Copy so the cached data are not modified
+        df = _read_csv(path, path.stat().st_mtime_ns, **kwargs).copy()
+        df.insert(0, "scenario", label_from(p))
+        dfs.append(df)
+
+    return pd.concat(dfs, ignore_index=True)
 
 
 class ComparePDT(Plot):
@@ -241,14 +274,15 @@ class ComparePDT(Plot):
     factor = 1e6
 
     def generate(self, *paths: Path):
-        data = read_csvs(self.kind, *paths).eval("value = value / @self.factor")
+        data = read_csvs(self.kind, *paths)
+        data["value"] /= self.factor
 
         # Add factor to the unit expression
         if self.factor != 1.0:
             self.unit = f"{self.factor:.0e} {self.unit}"
 
         for _, ggplot in self.groupby_plot(data, "n"):
-            yield ggplot + p9.expand_limits(y=[5e-2, max(data["value"])])
+            yield ggplot + p9.expand_limits(y=[5e-2, data["value"].max()])
 
 
 class ComparePDTCap0(ComparePDT):
@@ -322,7 +356,7 @@ class InvCost0(Plot):
     ]
 
     def generate(self, data):
-        y_max = max(data["inv_cost"])
+        y_max = data["inv_cost"].max()
         self.unit = data["unit"].unique()[0]
 
         for _, ggplot in self.groupby_plot(data, "nl"):
@@ -361,7 +395,7 @@ class FixCost(Plot):
     ]
 
     def generate(self, data):
-        y_max = max(data["fix_cost"])
+        y_max = data["fix_cost"].max()
         self.unit = data["unit"].unique()[0]
 
         for _, ggplot in self.groupby_plot(data, "nl"):
@@ -380,7 +414,7 @@ class VarCost(Plot):
     ]
 
     def generate(self, data):
-        y_max = max(data["var_cost"])
+        y_max = data["var_cost"].max()
         self.unit = data["unit"].unique()[0]
 
         for nl, ggplot in self.groupby_plot(data, "nl"):
@@ -425,9 +459,7 @@ class OutShareLDV0(Plot):
     def generate(self, data):
         # Normalize data
         # TODO Do this in genno
-        data["value"] = data["value"] / data.groupby(["nl", "ya"])["value"].transform(
-            "sum"
-        )
+        data = data.assign(value=_share(data, ["nl", "ya"]))
 
         yield from [ggplot for _, ggplot in self.groupby_plot(data, "nl")]
 
@@ -449,25 +481,28 @@ class OutShareLDV1(Plot):
         # - Recover the consumer group code from the commodity code.
         # - Select only the consumer groups.
         # - Recover the LDV technology code from the usage technology code.
-        data = (
-            data.assign(c=lambda df: df.c.str.replace("transport pax ", ""))
-            .query("c in @cg")
-            .assign(t=lambda df: df.t.str.split(" usage by ", expand=True)[0])
+        c = data.c.str.removeprefix("transport pax ")
+        mask = c.isin(cg)
+        data = data[mask].assign(
+            c=c[mask].to_numpy(),
+            t=lambda df: df.t.str.split(" usage by ", n=1, expand=True)[0],
         )
         # Normalize data
-        data["value"] = data["value"] / data.groupby(["c", "nl", "ya"])[
-            "value"
-        ].transform("sum")
+        data = data.assign(value=_share(data, ["c", "nl", "ya"]))
 
         yield from [ggplot for _, ggplot in self.groupby_plot(data, "nl")]
 
 
 def c_group(df: pd.DataFrame, cg):
-    return df.assign(
-        c_group=df.c.apply(
-            lambda v: "transport pax LDV" if any(cg_.id in v for cg_ in cg) else v
-        )
-    )
+    # Commodities that contain the ID of any consumer group `cg` are LDV commodities
+    pattern = "|".join(re.escape(cg_.id) for cg_ in cg)
+    if not pattern:
+        return df.assign(c_group=df.c)
+    # Match each distinct label once; code -1 (missing label) selects the final False
+    codes, uniques = pd.factorize(df.c)
+    hit = pd.Series(uniques, dtype=object).str.contains(pattern).to_numpy(dtype=bool)
+    is_ldv = np.append(hit, False)[codes]
+    return df.assign(c_group=df.c.mask(is_ldv, "transport pax LDV"))
 
 
 class Demand0(Plot):
@@ -484,12 +519,11 @@ class Demand0(Plot):
     @staticmethod
     def _prep_data(data, commodities, cg):
         # Convert and select data
-        _commodity = list(map(str, commodities))
         return (
-            data.query("c in @_commodity")
+            data[data.c.isin(set(map(str, commodities)))]
             .pipe(c_group, cg)
-            .groupby(["c_group", "n", "y"])
-            .aggregate({"demand": "sum"})
+            .groupby(["c_group", "n", "y"], observed=True)["demand"]
+            .sum()
             .reset_index()
         )
 
@@ -506,9 +540,7 @@ class Demand1(Demand0):
     def generate(self, data, commodities, cg):
         data = self._prep_data(data, commodities, cg)
         # Normalize
-        data["demand"] = data["demand"] / data.groupby(["n", "y"])["demand"].transform(
-            "sum"
-        )
+        data = data.assign(demand=_share(data, ["n", "y"], "demand"))
         yield from [ggplot for _, ggplot in self.groupby_plot(data, "n")]
 
 
@@ -525,19 +557,25 @@ class DemandCap(Plot):
 
     def generate(self, data, commodities, cg):
         # Convert and select data
-        data = data.query(f"c in {repr(list(map(str, commodities)))}").pipe(c_group, cg)
+        data = data[data.c.isin(set(map(str, commodities)))].pipe(c_group, cg)
         for _, ggplot in self.groupby_plot(data, "n"):
             yield ggplot
 
 
+@lru_cache
+def _conversion(units: str, target_units: str) -> tuple[float, str]:
+    """Return the factor and abbreviated units for converting `units`."""
+    tmp = registry.Quantity(1.0, units).to(target_units)
+    return float(tmp.magnitude), f"{tmp.units:~}"
+
+
 def _reduce_units(df: pd.DataFrame, target_units) -> tuple[pd.DataFrame, str]:
     df_units = df["unit"].unique()
     assert 1 == len(df_units)
-    tmp = registry.Quantity(1.0, df_units[0]).to(target_units)
-    return (
-        df.eval("value = value * @tmp.magnitude").assign(unit=f"{tmp.units:~}"),
-        f"{tmp.units:~}",
-    )
+    factor, units = _conversion(str(df_units[0]), str(target_units))
+    # Cast only the value column; no-op if it is already float
+    value = df["value"].astype(float) * factor
+    return df.assign(value=value, unit=units), units
 
 
 class DemandExo(Plot):
@@ -553,10 +591,8 @@ class DemandExo(Plot):
     ]
 
     def generate(self, data):
-        # FIXME shouldn't need to change dtype here
-        data = data.astype(dict(value=float))
         data, self.unit = _reduce_units(data, "Gp km / a")
-        y_max = max(data["value"])
+        y_max = data["value"].max()
 
         for _, ggplot in self.groupby_plot(data, "n"):
             yield ggplot + p9.expand_limits(y=[0, y_max])
@@ -575,10 +611,8 @@ class DemandExoCap0(Plot):
     ]
 
     def generate(self, data):
-        # FIXME shouldn't need to change dtype here
-        data = data.astype(dict(value=float))
         data, self.unit = _reduce_units(data, "Mm / a")
-        y_max = max(data["value"])
+        y_max = data["value"].max()
 
         for _, ggplot in self.groupby_plot(data, "n"):
             yield ggplot + p9.expand_limits(y=[0, y_max])
@@ -623,15 +657,18 @@ class EnergyCmdty0(Plot):
         p9.labs(x="Period", y="Energy", fill="Commodity"),
     ]
 
+    @staticmethod
+    def _select(data: pd.DataFrame, y0: int) -> pd.DataFrame:
+        """Discard data for certain commodities, and for periods before `y0`."""
+        keep = (
+            ~data.c.str.startswith("transport", na=False).to_numpy()
+            & (data.c.to_numpy() != "disutility")
+            & (data.ya.to_numpy() >= y0)
+        )
+        return data[keep]
+
     def generate(self, y0: int, data):
-        # Discard data for certain commodities
-        data = data[
-            ~(
-                data.c.str.startswith("transport")
-                | (data.c == "disutility")
-                | (data.ya < y0)
-            )
-        ]
+        data = self._select(data, y0)
 
         for _, ggplot in self.groupby_plot(data, "nl"):
             yield ggplot
@@ -643,19 +680,10 @@ class EnergyCmdty1(EnergyCmdty0):
     basename = "energy-c-share"
 
     def generate(self, y0: int, data):
-        # Discard data for certain commodities
-        data = data[
-            ~(
-                data.c.str.startswith("transport")
-                | (data.c == "disutility")
-                | (data.ya < y0)
-            )
-        ]
+        data = self._select(data, y0)
         # Normalize data
         # TODO Do this in genno
-        data["value"] = data["value"] / data.groupby(["nl", "ya"])["value"].transform(
-            "sum"
-        )
+        data = data.assign(value=_share(data, ["nl", "ya"]))
 
         for _, ggplot in self.groupby_plot(data, "nl"):
             yield ggplot
@@ -675,7 +703,7 @@ class Stock0(Plot):
     ]
 
     def generate(self, data):
-        y_max = max(data["CAP"])
+        y_max = data["CAP"].max()
         self.unit = data["unit"].unique()[0]
 
         for _, ggplot in self.groupby_plot(data, "nl"):
@@ -701,13 +729,44 @@ class Stock1(Plot):
         if not len(data):
             return
 
-        y_max = max(data["CAP"])
+        y_max = data["CAP"].max()
         self.unit = data["unit"].unique()[0]
 
         for _, ggplot in self.groupby_plot(data, "nl"):
             yield ggplot + p9.expand_limits(y=[0, y_max])
 
 
+#: :class:`.Plot` subclasses defined in this module, keyed by :attr:`~.Plot.basename`.
+PLOTS: dict[str, type[Plot]] = {
+    cls.basename: cls
+    for cls in (
+        BaseEnergy0,
+        CapNewLDV,
+        ComparePDT,
+        ComparePDTCap0,
+        ComparePDTCap1,
+        InvCost0,
+        InvCost1,
+        InvCost2,
+        FixCost,
+        VarCost,
+        LDV_IO,
+        OutShareLDV0,
+        OutShareLDV1,
+        Demand0,
+        Demand1,
+        DemandCap,
+        DemandExo,
+        DemandExoCap0,
+        DemandExoCap1,
+        EnergyCmdty0,
+        EnergyCmdty1,
+        Stock0,
+        Stock1,
+    )
+}
+
+
 def prepare_computer(c: Computer):
     """Add :data:`.PLOTS` to `c`.
 
@@ -726,11 +785,7 @@ def prepare_computer(c: Computer):
 
     config: "Config" = c.graph["config"]["transport"]
 
-    # Iterate over the Plot subclasses defined in the current module
-    for plot in filter(
-        lambda cls: isinstance(cls, type) and issubclass(cls, Plot) and cls is not Plot,
-        globals().values(),
-    ):
+    for plot in PLOTS.values():
         if (not plot.runs_on_solved_scenario and config.with_solution) or (
             False  # Use True here or uncomment below to skip some or all plots
             # "stock" not in plot.basename
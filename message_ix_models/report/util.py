@@ -81,10 +81,11 @@ def as_quantity(info: Union[dict, float, str]) -> Quantity:
     elif isinstance(info, float):
         return Quantity(info)
     elif isinstance(info, dict):
-        data = info.copy()
-        dim = data.pop("_dim")
-        unit = data.pop("_unit")
-        return Quantity(pd.Series(data).rename_axis(dim), units=unit)
+        # Keys other than "_dim" and "_unit" are labels along `dim`
+        labels = [k for k in info if k not in ("_dim", "_unit")]
+        index = pd.Index(labels, name=info["_dim"])
+        data = pd.Series([info[k] for k in labels], index=index)
+        return Quantity(data, units=info["_unit"])
     else:
         raise TypeError(type(info))
 
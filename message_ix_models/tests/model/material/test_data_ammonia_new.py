@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+
+@pytest.mark.parametrize("sheet_kw", (dict(), dict(skiprows=2), dict(nrows=2)))
+def test_excel_engine(tmp_path, sheet_kw) -> None:
+    """The "calamine" engine reads the same data as the :mod:`pandas` default."""
+    pytest.importorskip("python_calamine")
+
+    # Write a workbook with a note above the table, missing cells, and year columns
+    path = tmp_path.joinpath("test.xlsx")
+    df = pd.DataFrame(
+        {
+            "Region": ["AFR", "CHN", None, "WEU"],
+            2010: [1.0, np.nan, 3.5, 4.0],
+            2020: [1, 2, 3, 4],
+            "unit": ["Mt", "Mt", "Mt", None],
+        }
+    )
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, sheet_name="Sheet1", index=False)
+        pd.DataFrame([["Note"], [None]]).to_excel(
+            writer, sheet_name="Sheet2", header=False, index=False
+        )
+        df.to_excel(writer, sheet_name="Sheet2", startrow=2, index=False)
+
+    sheet_name = "Sheet2" if "skiprows" in sheet_kw else "Sheet1"
+    result = {}
+    for engine in (None, "calamine"):
+        with pd.ExcelFile(path, engine=engine) as xf:
+            result[engine] = xf.parse(sheet_name=sheet_name, **sheet_kw)
+
+    pdt.assert_frame_equal(result[None], result["calamine"])
@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
+import pandas.testing as pdt
 
-from message_ix_models.model.material.data_util import map_iea_db_to_msg_regs
+from message_ix_models.model.material.data_util import (
+    _deduct_regional_share,
+    map_iea_db_to_msg_regs,
+)
 
 DATA = [
     ["ALB", "R12_EEU"],
@@ -120,3 +125,19 @@ def test_map_iea_db_to_msg_regs() -> None:
     # - Add a column with True if these two are equal.
     # - Assert all are equal.
     assert df_out.merge(df, on="COUNTRY").eval("Z = REGION_x == REGION_y").Z.all()
+
+
+def test_deduct_regional_share() -> None:
+    df = pd.DataFrame(
+        [["R12_AFR", 1.0], ["R12_CHN", 2.0], ["R12_NAM", 3.0], ["R12_AFR", 4.0]],
+        columns=["node_loc", "value"],
+    )
+    share = pd.DataFrame([["AFR", 0.25], ["CHN", np.nan]], columns=["REGION", "i_spec"])
+
+    _deduct_regional_share(df, "node_loc", share, "i_spec", "R12_")
+
+    # Values are reduced by the share; a missing share gives a missing value; rows for
+    # regions not in `share` are unchanged
+    pdt.assert_series_equal(
+        pd.Series([0.75, np.nan, 3.0, 3.0], name="value"), df["value"]
+    )
@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Generator
+from contextlib import nullcontext
 from typing import TYPE_CHECKING
 
 import pytest
@@ -40,6 +41,31 @@ def test_apply_spec0(caplog, scenario: "Scenario", spec: Spec):
     ) in caplog.record_tuples
 
 
+def test_apply_spec_multi(caplog, scenario: "Scenario", spec: Spec):
+    """Required elements are checked, and elements added, for several sets."""
+    spec["require"].set["node"].extend(["seattle", "new-york"])
+    spec["require"].set["commodity"].append("cases")
+    spec["require"].set["technology"].append("canning_plant")
+    spec["add"].set["node"].append("vienna")
+    spec["add"].set["technology"].append("truck")
+
+    apply_spec(scenario, spec)
+
+    assert {"seattle", "new-york", "vienna"} <= set(scenario.set("node"))
+    assert {"canning_plant", "truck"} <= set(scenario.set("technology"))
+
+    # A missing element in one set is detected while other sets are complete
+    spec["require"].set["technology"].append("rail")
+    with pytest.raises(ValueError):
+        apply_spec(scenario, spec)
+
+    assert (
+        "message_ix_models.model.build",
+        logging.ERROR,
+        "  1 elements not found: ['rail']",
+    ) in caplog.record_tuples
+
+
 def test_apply_spec1(caplog, scenario: "Scenario", spec: Spec):
     """Add data using the data= argument."""
 
@@ -109,6 +135,59 @@ def test_apply_spec3(caplog, scenario: "Scenario", spec: Spec):
     )
 
 
+def test_apply_spec_batch_commit(caplog, scenario: "Scenario", spec: Spec):
+    """batch_commit_size= commits after removals; missing elements raise first."""
+    spec["remove"].set["node"] = ["new-york"]
+    # Missing element in a set that is handled after "node"
+    spec["require"].set["technology"] = ["rail"]
+
+    with pytest.raises(ValueError):
+        apply_spec(scenario, spec, batch_commit_size=1)
+
+    # Nothing was removed or committed before the exception
+    assert "new-york" in set(scenario.set("node"))
+    assert 1 == len(scenario.par("demand", filters={"node": ["new-york"]}))
+    assert not any("Commit after removing" in m for m in caplog.messages)
+
+    # Without the missing element, data are removed and committed in a batch
+    spec["require"].set.pop("technology")
+    apply_spec(scenario, spec, batch_commit_size=1)
+
+    assert_logs(caplog, "  Commit after removing 3 rows")
+    assert "new-york" not in set(scenario.set("node"))
+
+
+@pytest.mark.parametrize(
+    "has_solution, N_calls, expected",
+    (
+        (None, 1, None),
+        (False, 0, None),
+        # `scenario` has no solution, so the call to remove it raises
+        (True, 1, pytest.raises(ValueError)),
+    ),
+)
+def test_apply_spec_has_solution(
+    monkeypatch, scenario: "Scenario", spec: Spec, has_solution, N_calls, expected
+):
+    """has_solution= controls whether the solution of `scenario` is removed."""
+    spec["add"].set["node"] = ["vienna"]
+
+    # Record calls to Scenario.remove_solution()
+    calls = []
+    remove_solution = scenario.remove_solution
+
+    def wrapped(*args, **kwargs):
+        calls.append(args)
+        return remove_solution(*args, **kwargs)
+
+    monkeypatch.setattr(scenario, "remove_solution", wrapped)
+
+    with expected or nullcontext():
+        apply_spec(scenario, spec, has_solution=has_solution)
+
+    assert N_calls == len(calls)
+
+
 def test_apply_spec4(request, caplog, scenario: "Scenario", spec: Spec):
     """Test that platform region IDs are added as necessary."""
 
@@ -130,3 +209,20 @@ def test_apply_spec4(request, caplog, scenario: "Scenario", spec: Spec):
 
     # Nothing logged for the already-existing region ID
     assert not any("already defined" in message for message in caplog.messages)
+
+
+def test_apply_spec_quiet(caplog, scenario: "Scenario", spec: Spec):
+    """quiet=True only affects log messages for the duration of the call."""
+    caplog.set_level(logging.DEBUG, logger="message_ix_models.model.build")
+    spec.add.set["node"] = ["vienna"]
+    spec.require.set["node"] = ["seattle"]
+
+    apply_spec(scenario, spec, quiet=True)
+
+    # No messages logged below level ERROR
+    assert not any(r.name == "message_ix_models.model.build" for r in caplog.records)
+
+    apply_spec(scenario, spec)
+
+    # Messages logged by a subsequent call
+    assert_logs(caplog, "Set 'node'")
@@ -3,13 +3,18 @@ from typing import TYPE_CHECKING
 import genno
 import numpy as np
 import pandas as pd
+import pandas.testing as pdt
 import pytest
 from genno import Computer, KeySeq
 from genno.operator import relabel
 from genno.testing import random_qty
 
 from message_ix_models.model.structure import get_codes
-from message_ix_models.model.transport.base import format_share_constraints, smooth
+from message_ix_models.model.transport.base import (
+    _sort,
+    format_share_constraints,
+    smooth,
+)
 
 if TYPE_CHECKING:
     from genno.types import AnyQuantity
@@ -102,3 +107,28 @@ def test_format_share_constraints(qty, groupby, kind) -> None:
 
     assert not df.isna().any(axis=None)
     # TODO Expand with content assertions
+
+
+@pytest.mark.parametrize("arrow_min", [50_000, 1], ids=["numpy", "pyarrow"])
+def test_sort(monkeypatch, arrow_min) -> None:
+    # Use either the numpy or pyarrow implementation
+    monkeypatch.setattr(
+        "message_ix_models.model.transport.base._SORT_ARROW_MIN", arrow_min
+    )
+
+    df = pd.DataFrame(
+        [
+            ["b", 2020, 1.0],
+            [np.nan, 2020, 2.0],
+            ["a", 2025, 3.0],
+            ["b", np.nan, 4.0],
+            ["a", 2020, 5.0],
+            [np.nan, 2015, 6.0],
+        ],
+        columns=["n", "y", "value"],
+    ).astype({"n": object})
+
+    result = _sort(df, ("n", "y"))
+
+    # Same result as DataFrame.sort_values(), with missing values last
+    pdt.assert_frame_equal(df.sort_values(["n", "y"], kind="stable"), result)
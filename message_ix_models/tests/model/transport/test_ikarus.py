@@ -1,8 +1,8 @@
+import pandas as pd
 import pytest
 from iam_units import registry
 from message_ix import make_df
 from numpy.testing import assert_allclose
-from pandas.testing import assert_series_equal
 
 from message_ix_models.model.transport import build, testing
 from message_ix_models.model.transport.non_ldv import UNITS
@@ -90,24 +90,22 @@ def test_get_ikarus_data(test_context, regions, N_node, years, options):
         dict(year_vtg=2050, value=15.0),  # values of 14.7 are rounded to 15.0
     ]
 
-    for check in checks:
-        # Create expected data
-        check["year_act"] = check["year_vtg"]
-        exp = make_df(par_name, **defaults, **check)
-        assert len(exp) == 1, "Single row for expected value"
-
-        # Use merge() to find data with matching column values
-        columns = sorted(set(exp.columns) - {"value", "unit"})
-        result = exp.merge(data[par_name], on=columns, how="inner")
-
-        # Single row matches
-        assert len(result) == 1, result
-
-        # Values match
-        assert_series_equal(
-            result["value_x"],
-            result["value_y"],
-            check_exact=False,
-            check_names=False,
-            atol=1e-4,
-        )
+    # Create expected data: one row per check
+    exp = pd.concat(
+        [
+            make_df(par_name, **defaults, **check, year_act=check["year_vtg"])
+            for check in checks
+        ],
+        ignore_index=True,
+    )
+    assert len(exp) == len(checks), "Single row for each expected value"
+
+    # Use a single merge() to find data with matching column values
+    columns = sorted(set(exp.columns) - {"value", "unit"})
+    result = exp.merge(data[par_name], on=columns, how="inner")
+
+    # Exactly one row matches each check
+    assert [c["year_vtg"] for c in checks] == result["year_vtg"].tolist(), result
+
+    # Values match
+    assert_allclose(result["value_x"], result["value_y"], atol=1e-4)
@@ -433,3 +433,28 @@ def test_strip_par_data(caplog, test_context):
     )
     # Nothing was actually removed
     assert N == len(s.par("output"))
+
+
+def test_strip_par_data_list(caplog, test_context):
+    """:func:`.strip_par_data` with a list of elements."""
+    s = make_dantzig(test_context.get_platform())
+    s.check_out()
+
+    N = len(s.par("output"))
+    dump: dict = dict()
+    strip_par_data(
+        s, "technology", ["canning_plant", "transport_from_seattle"], dump=dump
+    )
+
+    assert_logs(
+        caplog,
+        [
+            "Remove data with technology in "
+            "['canning_plant', 'transport_from_seattle']",
+            "Remove 'canning_plant' from set 'technology'",
+            "Remove 'transport_from_seattle' from set 'technology'",
+        ],
+    )
+    # Data for both technologies were removed
+    assert N - len(dump["output"]) == len(s.par("output"))
+    assert "canning_plant" not in s.set("technology").tolist()
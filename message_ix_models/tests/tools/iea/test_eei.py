@@ -1,15 +1,13 @@
 import genno
+import numpy as np
 import pandas as pd
+import pandas.testing as pdt
 import pytest
 
 from message_ix_models.tools.exo_data import prepare_computer
-from message_ix_models.tools.iea.eei import IEA_EEI  # noqa: F401
+from message_ix_models.tools.iea.eei import IEA_EEI, wavg  # noqa: F401
 from message_ix_models.util import HAS_MESSAGE_DATA
 
-pytestmark = pytest.mark.skipif(
-    condition=not HAS_MESSAGE_DATA, reason="No fuzzed/random test data for this source."
-)
-
 # Infill data for R12 nodes not present in the IEA data
 # NB these are hand-picked as of 2022-07-20 so that the ratio of freight activity / GDP
 #    is roughly consistent across regions
@@ -30,6 +28,9 @@ R12_MAP = [
 ]
 
 
+@pytest.mark.skipif(
+    condition=not HAS_MESSAGE_DATA, reason="No fuzzed/random test data for this source."
+)
 class TestIEA_EEI:
     @pytest.mark.parametrize(
         "source_kw, dimensionality",
@@ -74,3 +75,46 @@ class TestIEA_EEI:
         assert 400 <= result.size
         assert {"n", "y"} | dimensionality == set(result.dims)
         assert N_n == len(result.coords["n"])
+
+
+def test_wavg() -> None:
+    columns = ["region", "year", "Mode/vehicle type", "value"]
+    df = pd.DataFrame(
+        [
+            ["R12_AFR", 2020, "Cars", 1.0],
+            ["R12_AFR", 2020, "Cars", 3.0],
+            ["R12_AFR", 2020, "Buses", 4.0],
+            ["R12_AFR", 2020, "Buses", np.nan],
+            ["R12_CHN", 2020, "Cars", 2.0],
+            ["R12_CHN", 2020, "Cars", np.inf],
+            ["R12_LAM", 2020, "Cars", 5.0],
+        ],
+        columns=columns,
+    ).assign(units="km")
+    pop = pd.DataFrame(
+        [["R12_AFR", 2020, 2.0], ["R12_CHN", 2020, 3.0], ["R12_LAM", 2020, np.nan]],
+        columns=["region", "year", "value"],
+    ).assign(units="Mpassenger")
+
+    result = wavg("Passenger-kilometres per capita", df, dict(population=pop))
+
+    # One row per group, in order of first appearance. NaN or infinite values are
+    # omitted from the average; a group with only NaN weights gives NaN.
+    expected = pd.DataFrame(
+        [
+            ["R12_AFR", 2020, "Cars", 2.0],
+            ["R12_AFR", 2020, "Buses", 4.0],
+            ["R12_CHN", 2020, "Cars", 2.0],
+            ["R12_LAM", 2020, "Cars", np.nan],
+        ],
+        columns=columns,
+    ).assign(units="km", variable="Passenger-kilometres per capita")
+    pdt.assert_frame_equal(expected, result)
+
+    # More than one weight for the same region and year
+    with pytest.raises(pd.errors.MergeError):
+        wavg(
+            "Passenger-kilometres per capita",
+            df,
+            dict(population=pd.concat([pop, pop])),
+        )
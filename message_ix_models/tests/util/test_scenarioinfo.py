@@ -173,6 +173,54 @@ class TestScenarioInfo:
         assert 1963 == info.y0
         assert [1963, 1964, 1965] == info.Y
 
+    def test_from_scenario_sets(self, test_context) -> None:
+        """ScenarioInfo with only some sets from an existing Scenario."""
+        mp = test_context.get_platform()
+        scenario = make_dantzig(mp, multi_year=True)
+
+        info = ScenarioInfo.from_scenario_sets(scenario)
+
+        assert dict(
+            model="Canning problem (MESSAGE scheme)", scenario="multi-year", version=1
+        ) == dict(info)
+
+        # Only the requested sets are copied
+        assert {"node", "year"} == set(info.set)
+        assert {} == info.par
+        assert ScenarioInfo(scenario).N == info.N
+        assert 1963 == info.y0
+        assert [1963, 1964, 1965] == info.Y
+
+    def test_freeze(self) -> None:
+        info = ScenarioInfo()
+        info.set["commodity"] = [Code(id="coal"), "gas"]
+        info.set["cat_year"] = [["firstmodelyear", 2020]]
+
+        # set_fs is populated on first access
+        assert {"coal", "gas"} == info.set_fs["commodity"]
+        assert ("firstmodelyear", 2020) in info.set_fs["cat_year"]
+
+        # Snapshot is read-only
+        with pytest.raises(TypeError):
+            info.set_fs["commodity"] = frozenset()  # type: ignore [index]
+
+        # Snapshot is not updated until freeze() is called again
+        info.set["commodity"].append("oil")
+        assert "oil" not in info.set_fs["commodity"]
+        assert "oil" in info.freeze().set_fs["commodity"]
+
+        # update() discards the snapshot
+        other = ScenarioInfo()
+        other.set["commodity"] = ["hydrogen"]
+        info.update(other)
+        assert "hydrogen" in info.set_fs["commodity"]
+
+        # The snapshot is not an argument, and not used in comparison or repr()
+        with pytest.raises(TypeError):
+            ScenarioInfo(_set_fs={})  # type: ignore [call-arg]
+        assert ScenarioInfo() == ScenarioInfo().freeze()
+        assert "_set_fs" not in repr(ScenarioInfo().freeze())
+
     def test_from_url(self):
         si = ScenarioInfo.from_url("m/s#123")
         assert "m" == si.model
@@ -4,7 +4,7 @@
 
 import logging
 import re
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Optional
 
 import genno
 import numpy as np
@@ -158,31 +158,32 @@ class IEA_EEI(ExoDataSource):
         self.measure = "INDICATOR"
         self.name = measure.lower()
 
-        # Determine whether to perform a weighted average operation
+        # Weights for a weighted average operation; never set
+        # TODO Determine these, e.g. using WAVG_MAP; add operations to transform()
         self.weights = None
-        if False:  # pragma: no cover
-            # TODO This code never executes; update and reactivate
-            pass
 
     def __call__(self):
         from genno.operator import unique_units_from_dim
 
         tmp = (
-            iea_eei_data_raw(self.path)
+            iea_eei_data_raw(
+                self.path, measure=self.measure, mtime=self.path.stat().st_mtime
+            )
             .query(self.query)
             .rename(columns={"TIME_PERIOD": "y"})
         )
 
         # Identify dimensions
         # - Not the "value" or measure columns.
-        # - Not columns filled entirely with "__NA".
+        # - Not columns filled entirely with "__NA". This is checked before
+        #   uncategorize(), so that categorical columns compare integer codes.
         dims = [
             c
             for c, s in tmp.items()
-            if (c not in {"value", self.measure} and set(s.unique()) != {"__NA"})
+            if (c not in {"value", self.measure} and (s.empty or s.ne("__NA").any()))
         ]
 
-        return genno.Quantity(tmp.set_index(dims)["value"]).pipe(
+        return genno.Quantity(tmp.pipe(uncategorize).set_index(dims)["value"]).pipe(
             unique_units_from_dim, dim="UNIT_MEASURE"
         )
 
@@ -195,10 +196,6 @@ class IEA_EEI(ExoDataSource):
             c.add(k + "0", "broadcast_map", k, self.broadcast_map, rename=rename)
             k = k + "0"
 
-        if self.weights:
-            # TODO Add operations for computing a weighted mean
-            pass
-
         if self.plot:
             # Path for debug output
             context: "Context" = c.graph["context"]
@@ -225,7 +222,10 @@ class Plot(genno.compat.plotnine.Plot):
     ]
 
     def generate(self, data):
-        for mode, group_df in data.groupby("Mode/vehicle type"):
+        # One page per mode, in sorted order
+        for mode, group_df in data.groupby(
+            "Mode/vehicle type", sort=True, observed=True
+        ):
             yield p9.ggplot(group_df) + self.static + p9.ggtitle(mode)
 
 
@@ -236,19 +236,41 @@ MEASURE_UNIT_EXPR = re.compile(r"(?P<MEASURE1>.+) \((?P<UNIT_MEASURE>.+)\)")
 def extract_measure_and_units(df: pd.DataFrame) -> pd.DataFrame:
     # Identify the column containing a units expression: either "Indicator" or "Product"
     measure_unit_col = ({"Indicator", "Product"} & set(df.columns)).pop()
-    # - Split the identified column to UNIT_MEASURE and either INDICATOR or PRODUCT.
+    # - Split each distinct label in the identified column to UNIT_MEASURE and either
+    #   INDICATOR or PRODUCT.
+    # - Broadcast to all rows; missing labels (code -1) give missing values.
     # - Concatenate with the other columns.
+    codes, uniques = pd.factorize(df[measure_unit_col])
     return pd.concat(
         [
             df.drop(measure_unit_col, axis=1),
-            df[measure_unit_col]
+            pd.Series(uniques)
             .str.extract(MEASURE_UNIT_EXPR)
-            .rename(columns={"MEASURE1": measure_unit_col.upper()}),
+            .rename(columns={"MEASURE1": measure_unit_col.upper()})
+            .reindex(codes)
+            .set_axis(df.index),
         ],
         axis=1,
     )
 
 
+def uncategorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert any categorical columns in `df` back to the dtype of their categories."""
+    return df.astype(
+        {
+            c: s.cat.categories.dtype
+            for c, s in df.items()
+            if isinstance(s.dtype, pd.CategoricalDtype)
+        }
+    )
+
+
+def rstrip(df: pd.DataFrame) -> pd.DataFrame:
+    """Right-strip whitespace from columns containing strings; leave others as-is."""
+    columns = df.select_dtypes(include=["object", "string"]).columns
+    return df.assign(**{c: df[c].str.rstrip() for c in columns})
+
+
 def melt(df: pd.DataFrame) -> pd.DataFrame:
     """Melt on any dimensions."""
     index_cols = set(df.columns) & {
@@ -267,51 +289,84 @@ def melt(df: pd.DataFrame) -> pd.DataFrame:
 
 
 @cached
-def iea_eei_data_raw(path, non_iso_3166: Literal["keep", "discard"] = "discard"):
+def iea_eei_data_raw(
+    path,
+    non_iso_3166: Literal["keep", "discard"] = "discard",
+    measure: Optional[Literal["INDICATOR", "PRODUCT"]] = None,
+    mtime: Optional[float] = None,
+):
+    """Read and reshape the IEA EEI workbook at `path`.
+
+    If `measure` is given, only sheets that have a column with this name (title case,
+    for instance "Indicator") are parsed; others are skipped after reading their header
+    row.
+
+    `mtime` is not used, but is part of the cache key, so that cached data are not used
+    after the file at `path` is modified.
+    """
     from message_ix_models.util.pycountry import iso_3166_alpha_3
 
-    xf = pd.ExcelFile(path)
-
     dfs = []
-    for sheet_name in xf.sheet_names:
-        # Parse the sheet name
-        match = SECTOR_MEASURE_EXPR.fullmatch(sheet_name)
-        if match is None:
-            continue
-
-        # Preserve the sector and/or measure ID from the sheet name
-        s, m = match.groups()
-        assign: dict[str, str] = dict()
-        if s not in ("Activity",):
-            assign.update(SECTOR=s.lower())
-        if m in ("Energy", "Emissions"):
-            assign.update(MEASURE=m.lower())
-
-        # - Read the sheet.
-        # - Drop rows containing only null values.
-        # - Right-strip whitespaces from columns containing strings.
-        # - Assign sector and/or measure ID.
-        # - Extract units.
-        # - Melt from wide to long layout.
-        # - Drop null values.
-        df = (
-            xf.parse(sheet_name, header=1, na_values="..")
-            .dropna(how="all")
-            .apply(lambda col: col.str.rstrip() if col.dtype == object else col)
-            .assign(**assign)
-            .pipe(extract_measure_and_units)
-            # .replace(REPLACE)
-            .pipe(melt)
-            .dropna(subset="value")
-        )
-        assert not df.isna().any(axis=None)
-        dfs.append(df)
-
+    # Close the workbook once all sheets are parsed
+    with pd.ExcelFile(path) as xf:
+        for sheet_name in xf.sheet_names:
+            # Parse the sheet name
+            match = SECTOR_MEASURE_EXPR.fullmatch(sheet_name)
+            if match is None:
+                continue
+            elif (
+                measure
+                and measure.title()
+                not in xf.parse(sheet_name, header=1, nrows=0).columns
+            ):
+                continue  # Sheet has no data for `measure`
+
+            # Preserve the sector and/or measure ID from the sheet name
+            s, m = match.groups()
+            assign: dict[str, str] = dict()
+            if s not in ("Activity",):
+                assign.update(SECTOR=s.lower())
+            if m in ("Energy", "Emissions"):
+                assign.update(MEASURE=m.lower())
+
+            # - Read the sheet.
+            # - Drop rows containing only null values.
+            # - Right-strip whitespaces from columns containing strings.
+            # - Assign sector and/or measure ID.
+            # - Extract units.
+            # - Melt from wide to long layout.
+            # - Drop null values.
+            df = (
+                xf.parse(sheet_name, header=1, na_values="..")
+                .dropna(how="all")
+                .pipe(rstrip)
+                .assign(**assign)
+                .pipe(extract_measure_and_units)
+                # .replace(REPLACE)
+                .pipe(melt)
+                .dropna(subset="value")
+            )
+            assert not df.isna().any(axis=None)
+            dfs.append(df)
+
+    # Look up each distinct country name once
+    def _n(df: pd.DataFrame) -> pd.Series:
+        country = df["Country"]
+        return country.map({c: iso_3166_alpha_3(c) for c in country.unique()})
+
+    # Store labels as categoricals: each distinct string is held once, and the cached
+    # data are smaller. See uncategorize().
+    def _category(df: pd.DataFrame) -> pd.DataFrame:
+        labels = df.columns.difference(["TIME_PERIOD", "value"])
+        return df.astype(dict.fromkeys(labels, "category"))
+
+    # The per-sheet row labels are not meaningful; give the result a RangeIndex
     return (
-        pd.concat(dfs)
+        pd.concat(dfs, ignore_index=True)
         .fillna("__NA")
-        .assign(n=lambda df: df["Country"].apply(iso_3166_alpha_3))
+        .assign(n=_n)
         .drop("Country", axis=1)
+        .pipe(_category)
     )
 
 
@@ -341,6 +396,12 @@ def wavg(measure: str, df: pd.DataFrame, weight_data: pd.DataFrame) -> pd.DataFr
     Returns
     -------
     pandas.DataFrame
+
+    Raises
+    ------
+    pandas.errors.MergeError
+        if `weight_data` has more than one weight for any combination of the dimensions
+        it shares with `df`.
     """
     # Choose the measure for weights using `WAVG_MAP`.
     weights = WAVG_MAP.get(measure, "population")
@@ -350,28 +411,28 @@ def wavg(measure: str, df: pd.DataFrame, weight_data: pd.DataFrame) -> pd.DataFr
         weights = "population"
 
     # Align the data and the weights into a single data frame
+    # - Use only the key and value columns of the weights.
+    # - Each row of `df` must match at most one weight.
     id_cols = ["region", "year", "Mode/vehicle type"]
-    data = df.merge(
-        weight_data[weights],
-        on=list(filter(lambda c: c in weight_data[weights].columns, id_cols)),
-    )
+    on = list(filter(lambda c: c in weight_data[weights].columns, id_cols))
+    data = df.merge(weight_data[weights][on + ["value"]], on=on, validate="m:1")
 
-    units = data["units_x"].unique()
+    units = data["units"].unique()
     assert 1 == len(units), units
 
-    def _wavg(group):
-        # Create masked arrays, masking NaNs from the weighted average computation:
-        d = np.ma.masked_invalid(group["value_x"].values)
-        w = np.ma.masked_invalid(group["value_y"].values)
-        # Compute weighted average
-        return np.ma.average(d, weights=w)
+    # Weighted average within groups of `id_cols`, Σ(value · weight) / Σ(weight),
+    # omitting rows where either the value or the weight is NaN or infinite
+    d, w = data["value_x"], data["value_y"]
+    valid = np.isfinite(d) & np.isfinite(w)
 
-    # - Apply _wavg() to groups by `id_cols`.
-    # - Return to a data frame.
+    # - Sum numerator and denominator within groups, in order of first appearance.
+    # - Divide and return to a data frame.
     # - Re-insert "units" and "variable" columns.
     return (
-        data.groupby(id_cols)
-        .apply(_wavg)
+        data.assign(num=(d * w).where(valid, 0.0), den=w.where(valid, 0.0))
+        .groupby(id_cols, sort=False, observed=True)[["num", "den"]]
+        .sum()
+        .pipe(lambda df: df["num"] / df["den"])
         .rename("value")
         .reset_index()
         .assign(units=units[0], variable=measure)
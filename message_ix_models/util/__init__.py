@@ -811,19 +811,33 @@ def show_versions() -> str:
 def strip_par_data(  # noqa: C901
     scenario: message_ix.Scenario,
     set_name: str,
-    element: str,
+    element: Union[str, list[str]],
     dry_run: bool = False,
     dump: Optional["MutableParameterData"] = None,
+    *,
+    par_list: Optional[Collection[str]] = None,
+    index: Optional[MutableMapping[str, list[tuple[str, str]]]] = None,
 ) -> int:
     """Remove `element` from `set_name` in scenario, optionally dumping to `dump`.
 
     Parameters
     ----------
+    element : str or list of str
+        Element(s) to remove. If a :class:`list` is given, the data for all elements
+        are retrieved and removed with one call per parameter, rather than one call per
+        parameter per element.
     dry_run : bool, optional
         If :data:`True`, only show what would be done.
     dump : dict, optional
         If provided, stripped data are stored in this dictionary. Otherwise, they are
         discarded.
+    par_list : collection of str, optional
+        Names of parameters in `scenario`. If not given, :meth:`.Scenario.par_list` is
+        called.
+    index : dict, optional
+        Mapping from parameter names to lists of (index name, index set) pairs. Missing
+        entries are retrieved from `scenario` and stored. Callers that invoke this
+        function repeatedly can pass the same `index` to avoid repeated queries.
 
     Returns
     -------
@@ -834,15 +848,22 @@ def strip_par_data(  # noqa: C901
     --------
     add_par_data
     """
-    par_list = scenario.par_list()
+    elements = element if isinstance(element, list) else [element]
+    par_list = scenario.par_list() if par_list is None else par_list
+    index = dict() if index is None else index
     no_data = set()  # Names of parameters with no data being stripped
     total = 0  # Total observations stripped
+    chunks: dict[str, list[pd.DataFrame]] = defaultdict(list)  # Data to dump
 
     if dump is None:
         pars = []  # Don't iterate over parameters unless dumping
     else:
         log.info(
-            f"Remove data with {set_name}={element!r}"
+            (
+                f"Remove data with {set_name}={elements[0]!r}"
+                if len(elements) == 1
+                else f"Remove data with {set_name} in {elements!r}"
+            )
             + (" (DRY RUN)" if dry_run else "")
         )
         # Iterate over parameters with ≥1 dimensions indexed by `set_name`
@@ -855,13 +876,15 @@ def strip_par_data(  # noqa: C901
             )
             continue
 
+        if par_name not in index:
+            index[par_name] = list(
+                zip(scenario.idx_names(par_name), scenario.idx_sets(par_name))
+            )
+
         # Iterate over dimensions indexed by `set_name`
-        for dim, _ in filter(
-            lambda item: item[1] == set_name,
-            zip(scenario.idx_names(par_name), scenario.idx_sets(par_name)),
-        ):
-            # Check for contents of par_name that include `element`
-            par_data = scenario.par(par_name, filters={dim: element})
+        for dim, _ in filter(lambda item: item[1] == set_name, index[par_name]):
+            # Check for contents of par_name that include any of `elements`
+            par_data = scenario.par(par_name, filters={dim: elements})
             N = len(par_data)
             total += N
 
@@ -870,9 +893,7 @@ def strip_par_data(  # noqa: C901
                 no_data.add(par_name)
                 continue
             elif dump is not None:
-                dump[par_name] = pd.concat(
-                    [dump.get(par_name, pd.DataFrame()), par_data]
-                )
+                chunks[par_name].append(par_data)
 
             log.info(f"  {N} rows in {par_name!r}")
 
@@ -892,17 +913,27 @@ def strip_par_data(  # noqa: C901
             # NB would prefer to do the following, but raises an exception:
             # scenario.remove_par(par_name, key={set_name: [value]})
 
+    if dump is not None:
+        # Concatenate once per parameter with any existing contents of `dump`
+        for par_name, dfs in chunks.items():
+            dump[par_name] = pd.concat(
+                ([dump[par_name]] if par_name in dump else []) + dfs
+            )
+
     if not dry_run and dump is not None:
         log.info(f"  {total} rows total")
     if no_data:
         log.debug(f"No data removed from {len(no_data)} other parameters")
 
-    if not dry_run:
-        log.info(f"Remove {element!r} from set {set_name!r}")
+    if dry_run:
+        return total
+
+    for e in elements:
+        log.info(f"Remove {e!r} from set {set_name!r}")
         try:
-            scenario.remove_set(set_name, element)
-        except Exception as e:
-            if "does not have an element" in str(e):
+            scenario.remove_set(set_name, e)
+        except Exception as exc:
+            if "does not have an element" in str(exc):
                 log.info("  …not found")
             else:  # pragma: no cover
                 raise
@@ -3,9 +3,11 @@
 import logging
 import re
 from collections import defaultdict
+from collections.abc import Iterable, Mapping
 from dataclasses import InitVar, dataclass, field
 from itertools import product
-from typing import TYPE_CHECKING, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, cast
 
 import pandas as pd
 import pint
@@ -36,6 +38,7 @@ class ScenarioInfo:
 
     .. autosummary::
        ~ScenarioInfo.set
+       set_fs
        io_units
        is_message_macro
        N
@@ -92,6 +95,11 @@ class ScenarioInfo:
 
     _yv_ya: Optional[pd.DataFrame] = None
 
+    #: Snapshot of :attr:`.set`; see :meth:`.freeze`.
+    _set_fs: Optional[dict[str, frozenset]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self, scenario_obj: Optional["Scenario"], empty: bool):
         if not scenario_obj:
             return
@@ -106,12 +114,7 @@ class ScenarioInfo:
             return
 
         # Copy structure (set contents)
-        for name in scenario_obj.set_list():
-            value = scenario_obj.set(name)
-            try:
-                self.set[name] = value.tolist()
-            except AttributeError:
-                self.set[name] = value  # pd.DataFrame for ≥2-D set; don't convert
+        self._copy_sets(scenario_obj, scenario_obj.set_list())
 
         # Copy data for a limited set of parameters
         for name in ("duration_period",):
@@ -119,11 +122,35 @@ class ScenarioInfo:
 
         self.is_message_macro = "PRICE_COMMODITY" in scenario_obj.par_list()
 
+        self._yv_ya = scenario_obj.vintage_and_active_years()
+
+    def _copy_sets(self, scenario_obj: "Scenario", names: Iterable[str]) -> None:
+        """Copy the contents of sets `names` from `scenario_obj`, and set :attr:`y0`."""
+        self._set_fs = None
+        for name in names:
+            value = scenario_obj.set(name)
+            try:
+                self.set[name] = value.tolist()
+            except AttributeError:
+                self.set[name] = value  # pd.DataFrame for ≥2-D set; don't convert
+
         # Computed once
         fmy = scenario_obj.cat("year", "firstmodelyear")
         self.y0 = int(fmy[0]) if len(fmy) else self.set["year"][0]
 
-        self._yv_ya = scenario_obj.vintage_and_active_years()
+    @classmethod
+    def from_scenario_sets(
+        cls, scenario_obj: "Scenario", names: Iterable[str] = ("node", "year")
+    ) -> "ScenarioInfo":
+        """Create an instance with only the sets `names` copied from `scenario_obj`.
+
+        This is faster than ``ScenarioInfo(scenario_obj)`` for large scenarios, since
+        other sets and parameter data are not retrieved. :attr:`y0` is set as usual;
+        `names` must include "year" if `scenario_obj` has no first model year.
+        """
+        result = cls(scenario_obj, empty=True)
+        result._copy_sets(scenario_obj, names)
+        return result
 
     @classmethod
     def from_url(cls, url: str) -> "ScenarioInfo":
@@ -150,6 +177,45 @@ class ScenarioInfo:
 
         return self._yv_ya
 
+    def freeze(self) -> "ScenarioInfo":
+        """Store an immutable snapshot of :attr:`.set` as :attr:`.set_fs`.
+
+        Methods such as :meth:`update` and :meth:`year_from_codes` discard the snapshot,
+        so that :attr:`.set_fs` is recomputed on next access. Call this again after
+        modifying :attr:`.set` directly; otherwise :attr:`.set_fs` is not updated.
+
+        Returns
+        -------
+        ScenarioInfo
+            the same object, for chaining.
+        """
+
+        def _hashable(e):
+            if isinstance(e, sdmx_model.Code):
+                return e.id
+            return tuple(e) if isinstance(e, list) else e
+
+        result = {}
+        for name, elements in self.set.items():
+            if isinstance(elements, pd.DataFrame):
+                elements = elements.itertuples(index=False, name=None)
+            result[name] = frozenset(map(_hashable, elements))
+
+        self._set_fs = result
+        return self
+
+    @property
+    def set_fs(self) -> Mapping[str, frozenset]:
+        """Read-only mapping from set names to :class:`frozenset` of elements.
+
+        :class:`.Code` elements are stored by their IDs, and list elements as tuples,
+        so that membership can be tested in constant time. This is a snapshot made by
+        :meth:`.freeze`, which is called on first access.
+        """
+        if self._set_fs is None:
+            self.freeze()
+        return MappingProxyType(cast(dict[str, frozenset], self._set_fs))
+
     @property
     def N(self):
         """Elements of the set 'node'.
@@ -195,6 +261,7 @@ class ScenarioInfo:
 
     def update(self, other: "ScenarioInfo"):
         """Update with the set elements of `other`."""
+        self._set_fs = None
         for name, data_list in other.set.items():
             self.set[name].extend(
                 filter(lambda id: id not in self.set[name], data_list)
@@ -349,6 +416,7 @@ class ScenarioInfo:
 
         """
         # Clear existing values
+        self._set_fs = None
         if len(self.set["year"]):
             log.debug(f"Discard existing 'year' elements: {repr(self.set['year'])}")
             self.set["year"] = []